@@ -1,4 +1,3 @@
-import pygame
 from pygame.sprite import Sprite
 
 
@@ -8,28 +7,13 @@ class Alien(Sprite):
     def __init__(self, ai_game):
         """Initialize the alien and set its starting position."""
         super().__init__()
-        self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        # Load the alien image and set its rect attribute.
-        self.image = pygame.image.load('images/alien.bmp')
+        # Get the shared alien image and set its rect attribute.
+        self.image = ai_game.assets.load_image(self.settings.alien_image)
         self.rect = self.image.get_rect()
 
         # Start each new alien near the top left of the screen.
+        #   Movement is handled by the Fleet's shared offset.
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
-
-        # Store the alien's exact horizontal position.
-        self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect()
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True
-
-    def update(self):
-        """Move the alien right or left."""
-        self.x += (self.settings.alien_speed *
-                   self.settings.fleet_direction)
-        self.rect.x = self.x
\ No newline at end of file
@@ -5,8 +5,8 @@ from pygame.sprite import Sprite
 class AlienBullet(Sprite):
     """A class to manage bullets fired from aliens."""
 
-    def __init__(self, ai_game, alien):
-        """Create a bullet object at the alien's current position."""
+    def __init__(self, ai_game, alien_rect=None):
+        """Create a bullet object under the given alien rect."""
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
@@ -15,7 +15,13 @@ class AlienBullet(Sprite):
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.settings.alien_bullet_width,
                                 self.settings.alien_bullet_height)
-        self.rect.midbottom = alien.rect.midbottom
+        self.y = float(self.rect.y)
+        if alien_rect is not None:
+            self.reset(alien_rect)
+
+    def reset(self, alien_rect):
+        """Place the bullet under the alien's screen rect (used when recycled)."""
+        self.rect.midbottom = alien_rect.midbottom
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
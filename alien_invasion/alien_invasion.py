@@ -1,9 +1,12 @@
+import os
 import sys
-from time import sleep
+import argparse
+from time import sleep, perf_counter
 
 import pygame
 import random
 import atexit
+import logging
 
 from settings import Settings
 from game_stats import GameStats
@@ -13,29 +16,83 @@ from ship import Ship
 from bullet import Bullet
 from alien import Alien
 from alien_bullet import AlienBullet
+from fleet import Fleet
+from game_state import GameState
 
+from asset_cache import AssetCache
+from object_pool import ObjectPool
+from text_cache import TextCache
+from font_cache import FontCache
 from menu import Menu
 from level_system import LevelSystem
 from particle_system import ParticleEffect
+from renderer import DirtyRectRenderer
+from profiler import FrameProfiler, StartupTimer
+from camera import Camera
+from background import BackgroundManager
+from replay import InputRecorder
+from audio import AudioManager
+from telemetry import Telemetry
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, record=None, persist=None):
         """Initialize the game, and create game resources."""
+        # 启动计时：各阶段耗时和首帧时间（--startup-report 输出）
+        self.startup = StartupTimer()
+
+        # 无头模式：使用SDL的虚拟视频/音频驱动，不打开真实窗口
+        self.headless = headless
+        # 无头模式下没有玩家按键，通关后直接重新开始
+        self.auto_restart = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        # 真实玩家的对局才把最高分写回磁盘（默认跟随headless，
+        #   回放、蜂群压测和基准测试即使打开窗口也传False）
+        self.persist = not headless if persist is None else persist
+
         pygame.init()
         self.clock = pygame.time.Clock()
         self.settings = Settings()
-
-        # Initialize sound system
-        pygame.mixer.init()
-        self.sounds = {}
-        self._load_sounds()
-
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height))
+        self.startup.mark('pygame_init')
+
+        # 模拟时钟（毫秒），只随模拟步进前进，与真实时间无关
+        self.sim_ticks = 0
+        # 渲染插值比例：0为上一模拟状态，1为当前模拟状态
+        self.interpolation = 1.0
+        # 上一模拟步中位置有变化的元素组，只有这些组需要插值
+        self._moved_groups = frozenset()
+
+        # 模拟中的随机数只取自self.rng，每局开始时重新播种，
+        #   同一种子加同一输入序列得到同一局游戏。seed为None时每局随机选种子
+        self.fixed_seed = seed
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # 射击请求在下一个模拟步开始时处理，使输入落在确定的步上
+        self.fire_requested = False
+        # 输入录制器（--record时启用）
+        self.recorder = InputRecorder(record) if record else None
+
+        # 音效管理（混音通道分组、并发上限），音效在第一局开始时才加载
+        self.audio = AudioManager(self.settings)
+
+        screen_size = (self.settings.screen_width, self.settings.screen_height)
+        if self.settings.frame_rate_cap == 'vsync' and not headless:
+            # 垂直同步需要SCALED（或OPENGL）模式
+            self.screen = pygame.display.set_mode(
+                screen_size, pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode(screen_size)
         pygame.display.set_caption("Alien Invasion")
+        self.startup.mark('display')
+
+        # 共享图片缓存（需在创建窗口之后，才能转换像素格式）
+        self.assets = AssetCache()
+        self.text = TextCache(self.settings.text_cache_size,
+                              FontCache(self.settings.font_cache_file))
 
         # Create an instance to store game statistics,
         #   and create a scoreboard.
@@ -44,130 +101,104 @@ class AlienInvasion:
 
         self.ship = Ship(self)
         self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.aliens = Fleet(self)
 
         self.alien_bullets = pygame.sprite.Group()
         self.last_alien_shot_time = 0
 
+        # 子弹对象池，按设置预热
+        self.bullet_pool = ObjectPool(
+            lambda: Bullet(self), self.settings.bullet_pool_size)
+        self.alien_bullet_pool = ObjectPool(
+            lambda: AlienBullet(self), self.settings.alien_bullet_pool_size)
+
+        self.startup.mark('assets')
+
+        # 关卡系统（舰队阵型来自关卡数据）
+        self.level_system = LevelSystem(self)
+
         self._create_fleet()
+        self.startup.mark('levels')
 
         # Start Alien Invasion in an inactive state.
-        self.game_active = False
-        self.game_paused = False   #puase
+        self.state = GameState.MENU
+        # 重生等待结束的模拟时间
+        self.respawn_time = 0
+        # 是否有一局正在进行（尚未写入对局历史）
+        self.run_active = False
 
         # Make the Play button.
         self.play_button = Button(self, "Play")
 
         # 添加菜单系统
         self.menu = Menu(self)
-        
-        # 添加关卡系统
-        self.level_system = LevelSystem(self)
 
         # 添加FPS显示
-        self.fps_font = pygame.font.SysFont(None, 36)
+        self.fps_font = self.text.font(None, 36)
         self.last_fps = 0
+        self.startup.mark('menu')
+
+        # 遥测（默认关闭，enable_telemetry 开启）
+        self.telemetry = None
+
+        # 帧分析器（F3显示各阶段耗时叠加层）
+        self.profiler = FrameProfiler(self, self.settings.profiler_history,
+                                      self.settings.profiler_log_interval)
 
         # 粒子效果系统
-        self.particle_effect = ParticleEffect()
+        self.particle_effect = ParticleEffect(self.settings.particle_pool_size,
+                                              seed)
+
+        # 摄像机：世界层和屏幕抖动
+        self.camera = Camera(self.screen)
 
-        # 屏幕抖动效果
-        self.screen_shake = 0
-        self.screen_shake_intensity = 0
+        # 背景系统（每关的背景在第一次需要时加载）
+        self.background = BackgroundManager(self)
 
-        # 背景系统
-        self.backgrounds = []
-        self.current_background_y = 0
-        self._load_backgrounds()
+        # 脏矩形渲染器（仅在设置开启时使用）
+        self.renderer = DirtyRectRenderer(self.screen,
+                                          self.settings.dirty_rect_limit)
+        self._particle_rects = None
+        self._fps_rect = None
+        self._draw_offsets = None
+
+        # 菜单打开时冻结的游戏画面快照
+        self._frozen_frame = None
+        # 通关画面的文字覆盖层（进入胜利状态时合成）
+        self._victory_overlay = None
 
         # Register high score save on exit
         atexit.register(self._save_high_score_on_exit)
+        if self.recorder:
+            # 中途退出时也保存当前这一局的录像
+            atexit.register(self._finish_recording)
+        self.startup.mark('subsystems')
 
-    def _load_backgrounds(self):
-        """加载背景资源，优先动态图片，其次静态图片"""
-        self.backgrounds = {
-            'dynamic': [],
-            'static': [],
-            'fallback': self.settings.bg_color  # 纯色后备
-        }
-        
-        # 尝试加载动态背景
-        for bg_path in self.settings.background_types['dynamic']:
-            try:
-                # 注意：Pygame原生不支持GIF，需要额外处理
-                # 这里简化处理，实际需要GIF解码库
-                bg_image = self._load_animated_background(bg_path)
-                if bg_image:
-                    self.backgrounds['dynamic'].append(bg_image)
-            except:
-                pass
-        
-        # 如果动态背景加载失败，加载静态背景
-        if not self.backgrounds['dynamic']:
-            for bg_path in self.settings.background_types['static']:
-                try:
-                    bg_image = pygame.image.load(bg_path).convert()
-                    bg_image = pygame.transform.scale(
-                        bg_image, 
-                        (self.settings.screen_width, self.settings.screen_height)
-                    )
-                    self.backgrounds['static'].append(bg_image)
-                except:
-                    pass
-
-    def _load_animated_background(self, path):
-        """加载动态背景（简化实现）"""
-        # 实际项目中需要使用pygame_gif或类似库处理GIF
-        # 这里返回静态图片作为占位符
-        try:
-            static_img = pygame.image.load(path.replace('.gif', '.png'))
-            static_img = pygame.transform.scale(
-                static_img, 
-                (self.settings.screen_width, self.settings.screen_height)
-            )
-            return static_img
-        except:
-            return None
+    def _current_background(self):
+        """返回当前关卡的背景表面（动画背景为当前帧），加载失败时为纯色"""
+        return self.background.get(
+            self.level_system.background_index(self.stats.level))
 
     def _draw_background(self, screen):
-        """绘制背景，按优先级选择背景类型"""
-        # 根据当前关卡选择背景索引
-        current_level = min(self.stats.level - 1, 4)  # 假设最多5个关卡
-        
-        # 优先使用动态背景
-        if self.backgrounds['dynamic']:
-            bg_index = current_level % len(self.backgrounds['dynamic'])
-            bg_image = self.backgrounds['dynamic'][bg_index]
-            screen.blit(bg_image, (0, 0))
-        # 其次使用静态背景
-        elif self.backgrounds['static']:
-            bg_index = current_level % len(self.backgrounds['static'])
-            bg_image = self.backgrounds['static'][bg_index]
-            screen.blit(bg_image, (0, 0))
-        # 最后使用纯色背景
+        """绘制当前关卡的背景"""
+        background = self._current_background()
+        if isinstance(background, pygame.Surface):
+            screen.blit(background, (0, 0))
         else:
-            screen.fill(self.backgrounds['fallback'])
+            screen.fill(background)
 
 
     def _alien_fire_bullet(self):
         """Alien firing bullets logic."""
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_ticks
         if (current_time - self.last_alien_shot_time > 
             self.settings.alien_fire_frequency and self.aliens):
             
-            # Find bottom-most alien in each column to shoot
-            aliens_by_column = {}
-            for alien in self.aliens:
-                col = alien.rect.centerx // 50  # Group by approximate column
-                if col not in aliens_by_column or aliens_by_column[col].rect.bottom < alien.rect.bottom:
-                    aliens_by_column[col] = alien
-            
-            # Let one random column shoot
-            if aliens_by_column and len(self.alien_bullets) < self.settings.alien_bullets_allowed:
-                import random
-                shooting_alien = random.choice(list(aliens_by_column.values()))
+            # Let the bottom-most alien of one random column shoot
+            if len(self.alien_bullets) < self.settings.alien_bullets_allowed:
+                shooting_alien = self.aliens.random_shooter()
                 self._create_alien_bullet(shooting_alien)
-                self.sounds['alien_shoot'].play()
+                self.audio.play('alien_shoot')
                 self.last_alien_shot_time = current_time
 
     def _update_alien_bullets(self):
@@ -175,17 +206,20 @@ class AlienInvasion:
         self.alien_bullets.update()
         
         # 删除超出屏幕的子弹
-        for bullet in self.alien_bullets.copy():
+        for bullet in self.alien_bullets.sprites():
             if bullet.rect.top >= self.settings.screen_height:
                 self.alien_bullets.remove(bullet)
+                self.alien_bullet_pool.release(bullet)
         
         # 检测子弹与飞船的碰撞
         collisions = pygame.sprite.spritecollide(self.ship, self.alien_bullets, True)
 
         if collisions:
-            # 触发屏幕抖动
-            self.screen_shake = 10  # 抖动持续时间
-            self.screen_shake_intensity = 5  # 抖动强度
+            for bullet in collisions:
+                self.alien_bullet_pool.release(bullet)
+
+            # 触发屏幕抖动：持续10步，强度5像素
+            self.camera.shake(10, 5)
             
             # 为每个击中的子弹添加护盾受损效果
             for bullet in collisions:
@@ -209,36 +243,198 @@ class AlienInvasion:
                 )
                 self._ship_hit()
             else:
-                self.sounds['shield_hit'].play()
+                self.audio.play('shield_hit')
+
+    @property
+    def game_active(self):
+        """游戏是否已开始（未处于主菜单）"""
+        return self.state != GameState.MENU
+
+    @property
+    def game_paused(self):
+        """游戏是否处于暂停菜单"""
+        return self.state == GameState.PAUSED
+
+    def set_state(self, state):
+        """切换游戏状态，并同步鼠标指针的显示"""
+        self.state = state
+        pygame.mouse.set_visible(state in GameState.FROZEN)
+
+    def _reset_simulation(self, seed=None):
+        """新的一局：重新播种随机数、模拟时钟归零，并开始录制（如果启用）"""
+        if seed is None:
+            seed = self.fixed_seed
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.rng.seed(seed)
+        self.particle_effect.reseed(seed)
+        self.particle_effect.clear()
+        # 不影响第一帧的资源推迟到第一局开始时准备；
+        #   各关的背景也在这里加载，关卡切换时不再解码图片
+        self.particle_effect.prewarm()
+        self.audio.load()
+        for level in range(1, self.level_system.max_levels + 1):
+            self.background.preload(self.level_system.background_index(level))
+
+        self.sim_ticks = 0
+        self.last_alien_shot_time = 0
+        self.fire_requested = False
+        self.camera.stop_shake()
+
+        if self.recorder:
+            self.recorder.start(self)
+        self.run_active = True
+
+    def _end_run(self):
+        """一局结束（游戏结束、通关、回到主菜单或退出）时写入对局历史"""
+        if not self.run_active:
+            return
+        self.run_active = False
+        self.stats.record_run(self.menu.difficulty_level, self.sim_ticks)
+        if self.telemetry:
+            self.telemetry.record_run({
+                'score': self.stats.score,
+                'level': self.stats.level,
+                'difficulty': self.menu.difficulty_level,
+                'duration_ms': int(self.sim_ticks),
+                'shots_fired': self.stats.shots_fired,
+            })
+
+    def enable_telemetry(self, directory=None):
+        """开始采集遥测，写入directory（默认settings.telemetry_dir）"""
+        settings = self.settings
+        self.telemetry = Telemetry(
+            self, directory or settings.telemetry_dir,
+            settings.telemetry_sample_interval,
+            settings.telemetry_buffer_size,
+            settings.telemetry_flush_interval,
+            settings.telemetry_max_bytes,
+            settings.telemetry_backup_count)
+
+    def _finish_recording(self):
+        """一局结束（回到主菜单、通关或退出）时写出录像"""
+        if self.recorder and self.recorder.active:
+            path = self.recorder.finish(self)
+            if path:
+                print(f"录像已保存: {path}")
 
     def _save_high_score_on_exit(self):
         """Save high score when game exits."""
-        self.stats.save_high_score()
+        self._end_run()
+        self.stats.close()
+        if self.telemetry:
+            self.telemetry.close()
+
+    def run_game(self, max_frames=None, controller=None):
+        """Start the main loop for the game.
+
+        模拟以固定步长推进（累加器），渲染频率独立，
+        并在最近两个模拟状态之间插值绘制。
+        max_frames限制运行的帧数（None为一直运行）；controller为可选的回调，
+        每帧处理完事件后以游戏实例为参数调用，可用来驱动输入或采样。
+        """
+        step = 1 / self.settings.simulation_rate
+        max_lag = step * self.settings.max_steps_per_frame
+        accumulator = 0.0
+        previous = perf_counter()
+        profiler = self.profiler
+        frames = 0
+        while max_frames is None or frames < max_frames:
+            frames += 1
+            profiler.begin_frame()
+            now = perf_counter()
+            # 长时间卡顿后只追赶有限的步数，避免越追越慢
+            accumulator += min(now - previous, max_lag)
+            previous = now
 
-    def run_game(self):
-        """Start the main loop for the game."""
-        while True:
             self._check_events()
             self.menu.update_animation()
-
-            if self.game_active and not self.game_paused:
-                self.ship.update()
-
-                if self.ship.destroy_animation['active']:
-                    self.ship.update_destroy_animation()
-
-                self._update_bullets()
-                self._update_alien_bullets()
-                self._update_aliens()
-                self._alien_fire_bullet()
-                self.particle_effect.update()
-
-                if self.screen_shake > 0:
-                    self.screen_shake -= 1
+            if controller:
+                controller(self)
+            profiler.mark('events')
+
+            if self.state in GameState.SIMULATED:
+                while accumulator >= step and self.state in GameState.SIMULATED:
+                    self._update_game()
+                    accumulator -= step
+                self.interpolation = accumulator / step
+            else:
+                accumulator = 0.0
+                self.interpolation = 1.0
+            if self.state in (GameState.MENU, GameState.VICTORY):
+                self._finish_recording()
 
             self._update_screen()
-            self.clock.tick(60)
-            self.last_fps = int(self.clock.get_fps())
+            profiler.end_frame()
+            if self.telemetry:
+                self.telemetry.sample()
+            if self.startup.pending:
+                self.startup.mark('first_frame')
+                self.startup.finish()
+            self._tick()
+
+    def _tick(self):
+        """按帧率上限等待（'vsync'时由flip等待显示器刷新）"""
+        cap = self.settings.frame_rate_cap
+        self.clock.tick(cap if isinstance(cap, int) else 0)
+        self.last_fps = int(self.clock.get_fps())
+
+    def run_headless(self, max_steps, controller=None):
+        """不绘制、不限帧地推进模拟，返回实际模拟的步数
+
+        controller为可选的回调，每一步前以游戏实例为参数调用，
+        可用来驱动飞船移动和射击。游戏结束时提前返回。
+        """
+        if not self.game_active:
+            self.menu.start_game()
+
+        steps = 0
+        while steps < max_steps and self.game_active:
+            if controller:
+                controller(self)
+            self._update_game()
+            steps += 1
+        self._finish_recording()
+        return steps
+
+    def _update_game(self):
+        """推进一个模拟步（与窗口和帧率无关）"""
+        if self.recorder and self.recorder.active:
+            self.recorder.record(self)
+        self.sim_ticks += self.settings.sim_step_ms
+
+        self._moved_groups = GameState.MOVING.get(self.state, frozenset())
+        mark = self.profiler.mark
+        if self.state == GameState.PLAYING:
+            if self.fire_requested:
+                self._fire_bullet()
+            self.fire_requested = False
+            self.ship.update()
+            mark('ship')
+            self._update_bullets()
+            mark('bullets')
+            self._update_alien_bullets()
+            mark('alien_bullets')
+            self._update_aliens()
+            mark('aliens')
+            self._alien_fire_bullet()
+            mark('alien_fire')
+        elif self.state == GameState.DYING:
+            # 摧毁动画期间其余游戏元素静止
+            if self.ship.update_destroy_animation():
+                self._respawn()
+        elif self.state == GameState.RESPAWNING:
+            # 飞船可以移动，舰队在等待结束后才开始行动
+            self.ship.update()
+            mark('ship')
+            if self.sim_ticks >= self.respawn_time:
+                self.set_state(GameState.PLAYING)
+
+        self.particle_effect.update()
+        mark('particles')
+
+        self.camera.update()
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""    
@@ -251,43 +447,42 @@ class AlienInvasion:
                 self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
-                # 游戏活跃且未暂停时，鼠标左键可以射击
-                if self.game_active and not self.game_paused and event.button == 1:
-                    self._fire_bullet()
-                # 游戏不活跃或暂停时，检查播放按钮和菜单
-                elif not self.game_active or self.game_paused:
+                # 游戏进行中，鼠标左键可以射击
+                if self.state == GameState.PLAYING and event.button == 1:
+                    self.fire_requested = True
+                # 菜单中检查播放按钮
+                elif self.state == GameState.MENU:
                     self._check_play_button(mouse_pos)
                 
-            # 处理菜单事件 - 只有当游戏不活跃或暂停时
-            if not self.game_active or self.game_paused:
+            # 处理菜单事件 - 只有主菜单和暂停菜单打开时
+            if self.state in (GameState.MENU, GameState.PAUSED):
                 self.menu.handle_events(event)
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
-        if button_clicked and not self.game_active:
-            # Reset the game settings.
+        if button_clicked and self.state == GameState.MENU:
+            # Reset the game settings, then apply level 1's data.
             self.settings.initialize_dynamic_settings()
+            self.menu.apply_difficulty()
+            self.level_system.load_level(1)
 
             # Reset the game statistics.
             self.stats.reset_stats()
             self.sb.prep_score()
             self.sb.prep_level()
             self.sb.prep_ships()
-            self.game_active = True
+            self.state = GameState.PLAYING
 
             # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
+            self._clear_bullets()
             self.aliens.empty()
-            self.alien_bullets.empty()
 
             # Create a new fleet and center the ship.
             self._create_fleet()
             self.ship.center_ship()
-
-            # Ensure high score is loaded
-            self.stats._load_high_score()
-            self.sb.prep_high_score()
+            self.ship.reset_shield()
+            self._reset_simulation()
 
             #Don't hide the mouse cursor.
             #pygame.mouse.set_visible(False)
@@ -301,27 +496,27 @@ class AlienInvasion:
         elif event.key == pygame.K_q:
             sys.exit()
         elif event.key == pygame.K_SPACE:
-            if self.game_active and not self.game_paused:
-                self._fire_bullet()
-        elif event.key == pygame.K_p:  # 暂停游戏
-            self.game_paused = not self.game_paused
-            if self.game_paused:
-                self.menu.active_menu = "pause"
-                self.menu.selected_option = 0
-                pygame.mouse.set_visible(True)
-            else:
-                pygame.mouse.set_visible(False)
-        elif event.key == pygame.K_ESCAPE:  # ESC键处理
-            self.game_paused = not self.game_paused
-            if self.game_paused:
-                self.menu.active_menu = "pause"
-                self.menu.selected_option = 0
-                pygame.mouse.set_visible(True)
-            else:
-                pygame.mouse.set_visible(False)
+            if self.state == GameState.PLAYING:
+                self.fire_requested = True
+        elif event.key == pygame.K_F3:  # 帧分析叠加层
+            self.profiler.toggle()
+        elif event.key in (pygame.K_p, pygame.K_ESCAPE):  # 暂停/继续游戏
+            self._toggle_pause()
         elif event.key == pygame.K_r:  # 新增R键重新开始
-            if not self.game_active:  # 只在游戏非活跃时有效
+            if self.state == GameState.VICTORY:
                 self._restart_game()
+                self.set_state(GameState.PLAYING)
+            elif self.state == GameState.MENU:  # 主菜单中只重置，不开始
+                self._restart_game(begin=False)
+
+    def _toggle_pause(self):
+        """在游戏进行和暂停菜单之间切换"""
+        if self.state == GameState.PLAYING:
+            self.menu.active_menu = "pause"
+            self.menu.selected_option = 0
+            self.set_state(GameState.PAUSED)
+        elif self.state == GameState.PAUSED:
+            self.set_state(GameState.PLAYING)
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
@@ -333,9 +528,11 @@ class AlienInvasion:
     def _fire_bullet(self):
         """Create a new bullet and add it to the bullets group."""
         if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
+            new_bullet = self.bullet_pool.acquire()
+            new_bullet.reset(self.ship)
             self.bullets.add(new_bullet)
-            self.sounds['shoot'].play()
+            self.stats.shots_fired += 1
+            self.audio.play('shoot')
 
     def _update_bullets(self):
         """Update position of bullets and get rid of old bullets."""
@@ -343,34 +540,37 @@ class AlienInvasion:
         self.bullets.update()
 
         # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
+        for bullet in self.bullets.sprites():
             if bullet.rect.bottom <= 0:
                 self.bullets.remove(bullet)
+                self.bullet_pool.release(bullet)
 
         self._check_bullet_alien_collisions()
 
     def _check_bullet_alien_collisions(self):
         """响应子弹-外星人碰撞"""
         # 移除发生碰撞的子弹和外星人
-        collisions = pygame.sprite.groupcollide(
-                self.bullets, self.aliens, True, True)
+        collisions = self.aliens.groupcollide(self.bullets, True, True)
 
         if collisions:
-            self.sounds['explosion'].play()  # 播放爆炸音效
+            for bullet in collisions:
+                self.bullet_pool.release(bullet)
+            self.audio.play('explosion')
             for aliens in collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
                 # 为每个被击中的外星人添加爆炸粒子效果
                 for alien in aliens:
+                    rect = self.aliens.rect_on_screen(alien)
                     self.particle_effect.create_explosion(
-                        alien.rect.centerx, 
-                        alien.rect.centery
+                        rect.centerx, 
+                        rect.centery
                     )
             self.sb.prep_score()
             self.sb.check_high_score()
 
         if not self.aliens:
             # 销毁现有子弹并创建新舰队
-            self.bullets.empty()
+            self.bullet_pool.release_group(self.bullets)
             
             # 检查是否还有下一关
             if self.stats.level < self.level_system.max_levels:
@@ -390,55 +590,49 @@ class AlienInvasion:
                 # 所有关卡已完成，显示胜利信息或重新开始
                 self._show_victory_message()
 
-        if not self.aliens:
-            # Destroy existing bullets and create new fleet.
-            self.bullets.empty()
-            self._create_fleet()
-            self.settings.increase_speed()
-
-            # Increase level.
-            self.stats.level += 1
-            self.sb.prep_level()
-
     def _ship_hit(self):
         """Respond to the ship being hit by an alien."""
+        if self.state != GameState.PLAYING or self.settings.ship_invulnerable:
+            # 同一步内的多次命中只处理一次
+            return
+
         if self.stats.ships_left > 0:
-            # 开始摧毁动画
+            # 开始摧毁动画，由主循环逐步推进
             self.ship.start_destroy_animation()
-            
-            # 等待动画完成
-            animation_done = False
-            while not animation_done:
-                animation_done = self.ship.update_destroy_animation()
-                self._update_screen()
-                self.clock.tick(60)
-
+            self.set_state(GameState.DYING)
+        else:
+            self._end_run()
+            self.menu.active_menu = "main"
+            self.menu.selected_option = 0
+            self.set_state(GameState.MENU)  # 游戏结束时显示鼠标
+
+    def _respawn(self):
+        """摧毁动画结束后扣除飞船，重建舰队并进入重生等待"""
+        # Decrement ships_left, and update scoreboard.
+        self.stats.ships_left -= 1
+        self.sb.prep_ships()
 
-            # Decrement ships_left, and update scoreboard.
-            self.stats.ships_left -= 1
-            self.sb.prep_ships()
+        # Get rid of any remaining bullets and aliens.
+        self._clear_bullets()
+        self.aliens.empty()
 
-            # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
-            self.aliens.empty()
-            self.alien_bullets.empty()
-            
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-            self.ship.reset_shield()
+        # Create a new fleet and center the ship.
+        self._create_fleet()
+        self.ship.center_ship()
+        self.ship.reset_shield()
 
-        else:
-            self.game_active = False
-            pygame.mouse.set_visible(True)  # 游戏结束时显示鼠标
+        self.respawn_time = self.sim_ticks + self.settings.respawn_delay
+        self.set_state(GameState.RESPAWNING)
 
     def _update_aliens(self):
         """Check if the fleet is at an edge, then update positions."""
+        self.aliens.remember_position()
         self._check_fleet_edges()
         self.aliens.update()
 
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
+        # Look for alien-ship collisions (only once the fleet reaches the ship).
+        if (self.aliens.check_bottom(self.ship.rect.top) and
+                self.aliens.collide_rect(self.ship.rect)):
             self._ship_hit()
 
         # Look for aliens hitting the bottom of the screen.
@@ -446,219 +640,259 @@ class AlienInvasion:
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
+        if self.aliens.check_bottom(self.settings.screen_height):
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
 
     def _create_fleet(self):
-        """根据当前关卡创建不同形状的外星人舰队"""
-        # 获取当前关卡
-        current_level = self.stats.level
-        
+        """按当前关卡数据中的阵型创建外星人舰队"""
         # 清空现有外星人
         self.aliens.empty()
-        
-        # 根据关卡创建不同形状的舰队
-        if current_level == 1:
-            self._create_level1_fleet()
-        elif current_level == 2:
-            self._create_level2_fleet()
-        elif current_level == 3:
-            self._create_level3_fleet()
-        elif current_level == 4:
-            self._create_level4_fleet()
-        else:
-            # 默认使用第一关的配置
-            self._create_level1_fleet()
-
-    def _create_level1_fleet(self):
-        """第一关：3x3方阵（9个外星人）"""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        
-        # 3x3方阵
-        rows, cols = 3, 3
-        for row in range(rows):
-            for col in range(cols):
-                x = alien_width + 2 * alien_width * col
-                y = alien_height + 2 * alien_height * row
-                self._create_alien(x, y)
-
-    def _create_level2_fleet(self):
-        """第二关：金字塔形（18个外星人）"""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        
-        # 金字塔形：1-2-3-4-3-2-1排列
-        pattern = [1, 2, 3, 4, 3, 2, 1]
-        for row, count in enumerate(pattern):
-            for col in range(count):
-                x = (self.settings.screen_width - count * 2 * alien_width) // 2 + 2 * alien_width * col
-                y = alien_height + 2 * alien_height * row
-                self._create_alien(x, y)
-
-    def _create_level3_fleet(self):
-        """第三关：菱形（27个外星人）"""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        
-        # 菱形排列
-        pattern = [1, 2, 3, 4, 5, 4, 3, 2, 1]
-        for row, count in enumerate(pattern):
-            for col in range(count):
-                x = (self.settings.screen_width - count * 2 * alien_width) // 2 + 2 * alien_width * col
-                y = alien_height + 2 * alien_height * row
-                self._create_alien(x, y)
-
-    def _create_level4_fleet(self):
-        """第四关：双线波浪形（36个外星人）"""
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        
-        # 双线波浪形排列
-        for wave in range(2):
-            for row in range(3):
-                for col in range(6):
-                    # 创建波浪效果
-                    offset_x = 50 * wave
-                    offset_y = 100 * wave
-                    
-                    x = alien_width + 2 * alien_width * col + offset_x
-                    y = alien_height + 2 * alien_height * row + offset_y
-                    
-                    # 添加一些随机偏移创造波浪效果
-                    if row % 2 == 0:
-                        x += 20
-                    else:
-                        x -= 20
-                        
-                    self._create_alien(x, y)
 
+        # 阵型已编译为出生位置数组（关卡超出范围时使用第一关）
+        positions = self.level_system.spawn_positions(self.stats.level)
+        for x, y in positions.tolist():
+            self._create_alien(x, y)
 
     def _create_alien(self, x_position, y_position):
         """Create an alien and place it in the fleet."""
         new_alien = Alien(self)
-        new_alien.x = x_position
         new_alien.rect.x = x_position
         new_alien.rect.y = y_position
         self.aliens.add(new_alien)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
+        self.aliens.change_direction()
 
     def _update_screen(self):
-        # 绘制滚动背景
-        self._draw_background(self.screen)
+        """绘制一帧并显示到屏幕"""
+        mark = self.profiler.mark
+        self.background.update()
+        if not self.settings.dirty_rect_rendering:
+            self._draw_frame()
+            mark('draw')
+            pygame.display.flip()
+            mark('flip')
+            return
+
+        renderer = self.renderer
+        background_changed = renderer.needs_full_redraw(
+            id(self._current_background()))
+        if self._frame_fully_dirty():
+            # 抖动、菜单或摧毁动画覆盖的区域无法用元素矩形描述，下一帧仍需整屏重绘
+            self._draw_frame()
+            mark('draw')
+            renderer.present_full()
+        elif background_changed:
+            self._draw_frame()
+            rects = self._dirty_rects()
+            mark('draw')
+            renderer.present_full(rects)
+        else:
+            renderer.restore(self._current_background())
+            self._draw_frame(background=False)
+            rects = self._dirty_rects()
+            mark('draw')
+            renderer.present(rects)
+        mark('flip')
+
+    def _frame_fully_dirty(self):
+        """屏幕抖动、菜单或胜利画面覆盖、分析叠加层打开、飞船摧毁动画时整帧都需要重绘"""
+        return (self.camera.shaking
+                or self.state in GameState.FROZEN
+                or self.profiler.visible
+                or self.ship.destroy_animation['active'])
+
+    def _dirty_rects(self):
+        """收集本帧所有活动元素和HUD实际绘制到的矩形（新矩形，不随元素移动）"""
+        offsets = self._draw_offsets
+        dx, dy = offsets['bullets']
+        rects = [bullet.rect.move(dx, dy) for bullet in self.bullets.sprites()]
+        dx, dy = offsets['alien_bullets']
+        rects.extend(bullet.rect.move(dx, dy)
+                     for bullet in self.alien_bullets.sprites())
+        dx, dy = offsets['aliens']
+        rects.extend(alien.rect.move(dx, dy) for alien in self.aliens.sprites())
+        dx, dy = offsets['ship']
+        rects.append(self.ship.rect.move(dx, dy))
+        rects.append(self.ship.shield_rect().move(dx, dy))
+        if self._particle_rects:
+            rects.extend(self._particle_rects)
+        rects.extend(self.sb.dirty_rects())
+        if self._fps_rect:
+            rects.append(self._fps_rect)
+        return rects
+
+    def _draw_frame(self, background=True):
+        """把当前游戏画面绘制到屏幕表面（不翻转显示）"""
+        frozen = self.state in GameState.FROZEN
+
+        if frozen and self._frozen_frame is not None:
+            # 菜单或胜利画面期间游戏画面不变，直接复用快照
+            self.screen.blit(self._frozen_frame, (0, 0))
+        else:
+            # 按世界坐标绘制，抖动时由摄像机整体平移一次提交
+            world = self.camera.begin()
+            self._draw_world(world, background)
+            self.camera.present(self.settings.bg_color)
+            self._frozen_frame = self.screen.copy() if frozen else None
         
-        # 计算屏幕抖动偏移
-        offset_x, offset_y = 0, 0
-        if self.screen_shake > 0:
-            offset_x = random.randint(-self.screen_shake_intensity, self.screen_shake_intensity)
-            offset_y = random.randint(-self.screen_shake_intensity, self.screen_shake_intensity)
+        # 显示FPS
+        if self.menu.show_fps:
+            fps_text = self.text.render(self.fps_font, f"FPS: {self.last_fps}", (255, 255, 255))
+            self._fps_rect = self.screen.blit(fps_text, (10, self.settings.screen_height - 40))
+        else:
+            self._fps_rect = None
+
+        # 帧分析叠加层
+        self.profiler.draw(self.screen)
         
-        # 绘制游戏元素
-        # 先绘制子弹
-        for bullet in self.bullets.sprites():
-            temp_bullet_rect = bullet.rect.copy()
-            temp_bullet_rect.x += offset_x
-            temp_bullet_rect.y += offset_y
-            pygame.draw.rect(self.screen, bullet.color, temp_bullet_rect)
+        # 绘制菜单、胜利画面或按钮
+        if self.state == GameState.VICTORY:
+            self.screen.blit(self._victory_overlay, (0, 0))
+        elif frozen:
+            self.menu.draw(self.screen)
+        elif not self.game_active:
+            self.play_button.draw_button(self.screen)
 
-        # 绘制外星人子弹
-        for bullet in self.alien_bullets.sprites():
-            temp_bullet_rect = bullet.rect.copy()
-            temp_bullet_rect.x += offset_x
-            temp_bullet_rect.y += offset_y
-            pygame.draw.rect(self.screen, bullet.color, temp_bullet_rect)
+    def _draw_world(self, surface, background):
+        """把背景、游戏元素和计分板按世界坐标绘制到surface"""
+        # 绘制滚动背景
+        if background:
+            self._draw_background(surface)
+
+        # 插值：各组元素从当前状态向上一状态回退的偏移
+        offsets = self._interpolation_offsets()
+        self._draw_offsets = offsets
+        
+        # 绘制游戏元素
+        # 先绘制子弹，再绘制外星人子弹
+        self._fill_sprites(surface, self.bullets.sprites(), offsets['bullets'])
+        self._fill_sprites(surface, self.alien_bullets.sprites(),
+                           offsets['alien_bullets'])
         
         # 绘制外星人
-        for alien in self.aliens.sprites():
-            temp_alien_rect = alien.rect.copy()
-            temp_alien_rect.x += offset_x
-            temp_alien_rect.y += offset_y
-            self.screen.blit(alien.image, temp_alien_rect)
+        self._blit_sprites(surface, self.aliens.sprites(), offsets['aliens'])
         
         # 绘制飞船（如果不在摧毁动画中）
+        ship_offset = offsets['ship']
         if not self.ship.destroy_animation['active']:
-            temp_ship_rect = self.ship.rect.copy()
-            temp_ship_rect.x += offset_x
-            temp_ship_rect.y += offset_y
-            self.screen.blit(self.ship.image, temp_ship_rect)
+            self._blit_sprites(surface, (self.ship,), ship_offset)
         else:
             # 绘制摧毁动画
-            self.ship.draw_destroy_animation(self.screen, offset=(offset_x, offset_y))
+            self.ship.draw_destroy_animation(surface, offset=ship_offset)
         
         # 绘制护盾
-        self.ship.draw_shield(self.screen, offset=(offset_x, offset_y))
+        self.ship.draw_shield(surface, offset=ship_offset)
         
         # 绘制粒子效果
-        self.particle_effect.draw(self.screen)
+        self._particle_rects = self.particle_effect.draw(
+            surface, self.settings.dirty_rect_rendering,
+            1.0 - self.interpolation)
         
         # 绘制UI元素
-        self.sb.show_score(self.screen, offset=(offset_x, offset_y))
-        
-        # 显示FPS
-        if self.menu.show_fps:
-            fps_text = self.fps_font.render(f"FPS: {self.last_fps}", True, (255, 255, 255))
-            self.screen.blit(fps_text, (10 + offset_x, self.settings.screen_height - 40 + offset_y))
-        
-        # 绘制菜单或按钮
-        if not self.game_active or self.game_paused:
-            self.menu.draw(self.screen)
-        elif not self.game_active:
-            self.play_button.draw_button(self.screen, offset=(offset_x, offset_y))
-        
-        pygame.display.flip()
-
-    def _load_sounds(self):
-        """Load sound effects with fallback to silent placeholders."""
-        sound_files = {
-            'shoot': 'sounds/shoot.wav',
-            'explosion': 'sounds/explosion.wav',
-            'shield_hit': 'sounds/shield_hit.wav',
-            'alien_shoot': 'sounds/alien_shoot.wav'  # 新增外星人射击音效
-        }
-        
-        for name, filepath in sound_files.items():
-            try:
-                self.sounds[name] = pygame.mixer.Sound(filepath)
-            except pygame.error:
-                # Create silent sound as placeholder
-                self.sounds[name] = pygame.mixer.Sound(buffer=bytes([]))
+        self.sb.show_score(surface)
+
+    @staticmethod
+    def _fill_sprites(surface, sprites, offset):
+        """画出一组纯色矩形精灵；整组共用插值偏移，为零时直接使用精灵的矩形"""
+        if offset == (0, 0):
+            for sprite in sprites:
+                pygame.draw.rect(surface, sprite.color, sprite.rect)
+        else:
+            dx, dy = offset
+            for sprite in sprites:
+                pygame.draw.rect(surface, sprite.color,
+                                 sprite.rect.move(dx, dy))
+
+    @staticmethod
+    def _blit_sprites(surface, sprites, offset):
+        """用一次批量blits画出一组图像精灵；偏移为零时直接使用精灵的矩形"""
+        if offset == (0, 0):
+            surface.blits([(sprite.image, sprite.rect) for sprite in sprites],
+                          False)
+        else:
+            dx, dy = offset
+            surface.blits([(sprite.image, sprite.rect.move(dx, dy))
+                           for sprite in sprites], False)
+
+    def _interpolation_offsets(self):
+        """计算每组元素插值绘制时相对当前位置的偏移
+
+        只有上一模拟步中推进过的组才插值，静止的组（如摧毁动画期间）
+        直接画在当前位置，不会因为残留的上一步位置而抖动。
+        """
+        back = 1.0 - self.interpolation
+        zero = (0, 0)
+        offsets = {'bullets': zero, 'alien_bullets': zero,
+                   'aliens': self.aliens.offset, 'ship': zero}
+        moved = self._moved_groups
+        if back <= 0 or not moved:
+            return offsets
+        # 同组元素速度相同，整组共用一个偏移
+        if 'bullets' in moved:
+            offsets['bullets'] = (0, round(self.settings.bullet_speed * back))
+        if 'alien_bullets' in moved:
+            offsets['alien_bullets'] = (
+                0, -round(self.settings.alien_bullet_speed * back))
+        if 'aliens' in moved:
+            offsets['aliens'] = self.aliens.interpolation_offset(back)
+        if 'ship' in moved:
+            offsets['ship'] = (
+                round((self.ship.prev_x - self.ship.x) * back), 0)
+        return offsets
 
     def _create_alien_bullet(self, alien):
         """Create a new alien bullet and add it to the alien_bullets group."""
         if len(self.alien_bullets) < self.settings.alien_bullets_allowed:
-            new_alien_bullet = AlienBullet(self, alien)
+            new_alien_bullet = self.alien_bullet_pool.acquire()
+            new_alien_bullet.reset(self.aliens.rect_on_screen(alien))
             self.alien_bullets.add(new_alien_bullet)
 
+    def _clear_bullets(self):
+        """清空玩家和外星人的子弹，并归还到对象池"""
+        self.bullet_pool.release_group(self.bullets)
+        self.alien_bullet_pool.release_group(self.alien_bullets)
+
+    def pool_stats(self):
+        """返回各对象池的命中、未命中和峰值统计"""
+        return {
+            'bullets': self.bullet_pool.stats(),
+            'alien_bullets': self.alien_bullet_pool.stats(),
+            'particles': self.particle_effect.stats(),
+        }
+
     def _show_victory_message(self):
-        """显示通关胜利消息"""
+        """进入通关画面，由主循环绘制并等待玩家按R重新开始或按Q退出"""
+        self._end_run()
+        if self.auto_restart:
+            # 无头模式下没有玩家按键，直接重新开始
+            self._restart_game()
+            return
+
+        self._victory_overlay = self._compose_victory_overlay()
+        self.set_state(GameState.VICTORY)
+
+    def _compose_victory_overlay(self):
+        """合成通关画面的半透明背景和文字"""
         # 创建半透明背景
         s = pygame.Surface((self.settings.screen_width, self.settings.screen_height), pygame.SRCALPHA)
         s.fill((0, 0, 0, 180))
-        self.screen.blit(s, (0, 0))
         
-        # 创建字体
-        font_large = pygame.font.SysFont(None, 72)
-        font_small = pygame.font.SysFont(None, 36)
+        # 获取字体（只创建一次）
+        font_large = self.text.font(None, 72)
+        font_small = self.text.font(None, 36)
         
         # 渲染文本
-        victory_text = font_large.render("恭喜通关！", True, (255, 215, 0))
-        score_text = font_small.render(f"最终得分: {self.stats.score}", True, (255, 255, 255))
-        restart_text = font_small.render("按R键重新开始游戏", True, (200, 200, 200))
+        victory_text = self.text.render(font_large, "恭喜通关！", (255, 215, 0))
+        score_text = self.text.render(font_small, f"最终得分: {self.stats.score}", (255, 255, 255))
+        restart_text = self.text.render(font_small, "按R键重新开始游戏", (200, 200, 200))
         
         # 定位文本
         victory_rect = victory_text.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height // 2 - 50))
@@ -666,52 +900,71 @@ class AlienInvasion:
         restart_rect = restart_text.get_rect(center=(self.settings.screen_width // 2, self.settings.screen_height // 2 + 70))
         
         # 绘制文本
-        self.screen.blit(victory_text, victory_rect)
-        self.screen.blit(score_text, score_rect)
-        self.screen.blit(restart_text, restart_rect)
-        
-        pygame.display.flip()
-        
-        # 等待玩家按键
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:  # 按R键重新开始
-                        waiting = False
-                        self._restart_game()
-                    elif event.key == pygame.K_q:  # 按Q键退出
-                        pygame.quit()
-                        sys.exit()
-
-    def _restart_game(self):
-        """重新开始游戏"""
+        s.blit(victory_text, victory_rect)
+        s.blit(score_text, score_rect)
+        s.blit(restart_text, restart_rect)
+        return s
+
+    def _restart_game(self, begin=True):
+        """重新开始游戏
+
+        begin为False时只重置关卡、得分和舰队，不开始新的一局
+        （不重置模拟、不计入对局历史、不开始录制）。
+        """
+        self._frozen_frame = None
+        self._victory_overlay = None
         self.stats.reset_stats()
         self.sb.prep_score()
         self.sb.prep_level()
         self.sb.prep_ships()
         
         # 清空所有对象
-        self.bullets.empty()
+        self._clear_bullets()
         self.aliens.empty()
-        self.alien_bullets.empty()
         
-        # 重置关卡
-        self.level_system.current_level = 1
+        # 重置游戏设置（与菜单开始游戏一致，应用当前难度），
+        #   再回到第一关并应用它的关卡数据
+        self.settings.initialize_dynamic_settings()
+        self.menu.apply_difficulty()
         self.level_system.load_level(1)
         
         # 创建新舰队并居中飞船
         self._create_fleet()
         self.ship.center_ship()
         self.ship.reset_shield()
-        
-        # 重置游戏设置
-        self.settings.initialize_dynamic_settings()
+        if begin:
+            self._reset_simulation()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument('--headless', action='store_true',
+                        help="不打开窗口，以最快速度运行模拟")
+    parser.add_argument('--steps', type=int, default=60 * 60,
+                        help="无头模式下模拟的步数")
+    parser.add_argument('--seed', type=int,
+                        help="模拟随机数种子（默认每局随机）")
+    parser.add_argument('--record', metavar='PATH',
+                        help="把每局的种子和逐步输入录制到PATH，用replay.py回放")
+    parser.add_argument('--profile-log', type=int, default=0, metavar='FRAMES',
+                        help="每FRAMES帧把各阶段耗时写入日志（0为关闭）")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="第一帧显示后把启动各阶段耗时写入日志")
+    parser.add_argument('--telemetry', nargs='?', const='', metavar='DIR',
+                        help="采集帧和对局遥测，写入DIR（默认telemetry/）")
+    args = parser.parse_args()
+
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
-    ai.run_game()
\ No newline at end of file
+    ai = AlienInvasion(headless=args.headless, seed=args.seed,
+                       record=args.record)
+    if args.profile_log or args.startup_report:
+        logging.basicConfig(level=logging.INFO,
+                            format="%(asctime)s %(name)s %(message)s")
+    if args.profile_log:
+        ai.profiler.set_log_interval(args.profile_log)
+    if args.telemetry is not None:
+        ai.enable_telemetry(args.telemetry or None)
+    if args.headless:
+        steps = ai.run_headless(args.steps)
+        print(f"模拟 {steps} 步，得分 {ai.stats.score}，关卡 {ai.stats.level}")
+    else:
+        ai.run_game()
\ No newline at end of file
@@ -0,0 +1,28 @@
+import pygame
+
+
+class AssetCache:
+    """共享的图片资源缓存，每张图片只从磁盘加载一次"""
+
+    def __init__(self):
+        self.images = {}
+
+    def load_image(self, path, alpha=False):
+        """加载图片并转换为显示器像素格式，之后直接返回同一个表面"""
+        key = (path, alpha)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.image.load(path)
+            # convert()需要已创建的显示窗口
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha() if alpha else image.convert()
+            self.images[key] = image
+        return image
+
+    def image_size(self, path, alpha=False):
+        """返回图片尺寸，无需创建精灵"""
+        return self.load_image(path, alpha).get_size()
+
+    def clear(self):
+        """清空缓存（例如切换分辨率后）"""
+        self.images.clear()
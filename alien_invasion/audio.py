@@ -0,0 +1,144 @@
+from collections import Counter
+
+import pygame
+
+
+class AudioManager:
+    """音效管理：通道分组、同一音效的并发上限、抢占规则和统一音量
+
+    每个通道组（settings.sound_groups）保留固定数量的混音通道，
+    不同类别的音效不会互相挤占。每个音效（settings.sound_effects）有：
+      - group：使用的通道组
+      - voices：同时播放的上限；达到上限时 steal 为真则重新播放最早的一个，
+        否则丢弃这次播放
+      - priority：组内没有空闲通道时，可以抢占优先级不高于自己的声音中最早的一个
+      - interval：两次触发的最短间隔（毫秒），更密集的触发直接丢弃
+
+    播放、抢占和丢弃次数按音效名计数，可用 stats() 查看。
+    """
+
+    def __init__(self, settings):
+        self.effects = settings.sound_effects
+        self.group_sizes = settings.sound_groups
+        self.volume = 1.0
+        self.enabled = False
+        self.loaded = False
+
+        self.sounds = {}
+        # 通道组名 -> 通道列表
+        self.groups = {}
+        # 通道 -> (音效名, 开始序号)，序号越小越早
+        self.voices = {}
+        # 音效名 -> 上次触发的时间（毫秒）
+        self.last_played = {}
+        self._serial = 0
+
+        self.played = Counter()
+        self.stolen = Counter()
+        self.dropped = Counter()
+
+    def load(self):
+        """初始化混音器并加载音效（只在第一次调用时执行）"""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Warning: Audio disabled: {e}")
+            return
+
+        # 所有通道都保留给通道组，Sound.play不会占用组内的通道
+        total = sum(self.group_sizes.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        channel_id = 0
+        for group, size in self.group_sizes.items():
+            self.groups[group] = [pygame.mixer.Channel(channel_id + i)
+                                  for i in range(size)]
+            channel_id += size
+
+        for name, effect in self.effects.items():
+            try:
+                sound = pygame.mixer.Sound(effect['file'])
+            except (pygame.error, OSError):
+                # 缺少文件时用无声的占位音效
+                sound = pygame.mixer.Sound(buffer=bytes(2))
+            sound.set_volume(self.volume)
+            self.sounds[name] = sound
+        self.enabled = True
+
+    def set_volume(self, volume):
+        """设置所有音效的音量（0.0 - 1.0）"""
+        self.volume = volume
+        for sound in self.sounds.values():
+            sound.set_volume(volume)
+
+    def play(self, name):
+        """按通道组、并发上限和优先级规则播放音效"""
+        if not self.enabled:
+            return
+        effect = self.effects[name]
+        now = pygame.time.get_ticks()
+        interval = effect.get('interval', 0)
+        if interval and now - self.last_played.get(name, -interval) < interval:
+            self.dropped[name] += 1
+            return
+
+        channels = self.groups[effect['group']]
+        channel = self._pick_channel(name, effect, channels)
+        if channel is None:
+            self.dropped[name] += 1
+            return
+
+        self.last_played[name] = now
+        self._serial += 1
+        self.voices[channel] = (name, self._serial)
+        channel.play(self.sounds[name])
+        self.played[name] += 1
+
+    def _pick_channel(self, name, effect, channels):
+        """选择播放用的通道，没有可用通道时返回None"""
+        busy = [channel for channel in channels if channel.get_busy()]
+        same = [channel for channel in busy
+                if self.voices.get(channel, (None,))[0] == name]
+        if len(same) >= effect.get('voices', len(channels)):
+            if not effect.get('steal', False):
+                return None
+            self.stolen[name] += 1
+            return min(same, key=self._voice_serial)
+
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+
+        # 组内没有空闲通道：抢占优先级不高于自己的声音中最早的一个
+        #   （混音器是全局的，不是本管理器播放的声音视为最早、最低优先级）
+        priority = effect.get('priority', 0)
+        candidates = [channel for channel in busy
+                      if self._voice_priority(channel) <= priority]
+        if not candidates:
+            return None
+        victim = min(candidates, key=self._voice_serial)
+        self.stolen[self.voices.get(victim, (name,))[0]] += 1
+        return victim
+
+    def _voice_priority(self, channel):
+        voice = self.voices.get(channel)
+        return self.effects[voice[0]].get('priority', 0) if voice else 0
+
+    def _voice_serial(self, channel):
+        return self.voices.get(channel, (None, 0))[1]
+
+    def reset_stats(self):
+        self.played.clear()
+        self.stolen.clear()
+        self.dropped.clear()
+
+    def stats(self):
+        """播放、抢占和丢弃次数（按音效名）"""
+        return {
+            'played': dict(self.played),
+            'stolen': dict(self.stolen),
+            'dropped': dict(self.dropped),
+        }
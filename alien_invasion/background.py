@@ -0,0 +1,120 @@
+import os
+
+import pygame
+
+
+class BackgroundManager:
+    """背景资源管道
+
+    每个关卡的背景在第一次需要时才加载，缩放到屏幕分辨率并转换为显示器的
+    像素格式。缩放结果写入磁盘缓存（未压缩的BMP），之后启动时直接读取缓存，
+    跳过PNG解码和缩放；源文件更新后缓存自动失效。
+
+    背景定义（settings.backgrounds 中的一项）可以是：
+      - 图片路径：静态背景
+      - {'sheet': 路径, 'frames': 帧数, 'columns': 每行帧数, 'fps': 帧率}：
+        精灵表动画背景，整张表只缩放、转换一次，播放时直接从表中按区域取帧
+    """
+
+    def __init__(self, ai_game):
+        self.settings = ai_game.settings
+        self.size = (self.settings.screen_width, self.settings.screen_height)
+        self.cache_dir = self.settings.background_cache_dir
+        self.definitions = self.settings.backgrounds
+        self.fallback = self.settings.bg_color
+
+        # 背景序号 -> 已加载的背景（表面或动画），加载失败时为纯色后备
+        self.loaded = {}
+        # 当前帧的时间（毫秒），每帧开始时由 update 设置
+        self.time = 0
+
+    def update(self):
+        """每帧绘制前调用一次，保证同一帧内动画背景取到同一帧"""
+        self.time = pygame.time.get_ticks()
+
+    def get(self, index):
+        """返回背景序号对应的表面（动画背景为当前帧）或纯色"""
+        if not self.definitions:
+            return self.fallback
+        index %= len(self.definitions)
+        background = self.loaded.get(index)
+        if background is None:
+            background = self._load(self.definitions[index])
+            self.loaded[index] = background
+        if isinstance(background, SpriteSheetAnimation):
+            return background.frame(self.time)
+        return background
+
+    def preload(self, index):
+        """提前加载背景（例如在关卡切换前），避免第一次绘制时卡顿"""
+        self.get(index)
+
+    def clear(self):
+        """释放已加载的背景（磁盘缓存保留）"""
+        self.loaded.clear()
+
+    def _load(self, definition):
+        """加载一个背景定义，文件缺失或无法解码时退回纯色"""
+        try:
+            if isinstance(definition, dict):
+                return self._load_sheet(definition)
+            return self._load_scaled(definition, self.size)
+        except (pygame.error, OSError) as e:
+            print(f"Warning: Could not load background {definition}: {e}")
+            return self.fallback
+
+    def _load_sheet(self, definition):
+        """加载精灵表：每帧缩放到屏幕大小，整张表作为一个表面缓存"""
+        frames = definition['frames']
+        columns = definition.get('columns', frames)
+        rows = -(-frames // columns)
+        width, height = self.size
+        sheet = self._load_scaled(definition['sheet'],
+                                  (width * columns, height * rows))
+        return SpriteSheetAnimation(sheet, self.size, frames, columns,
+                                    definition.get('fps', 10))
+
+    def _load_scaled(self, path, size):
+        """读取size尺寸的缓存，缓存缺失或过期时解码、缩放源图并写入缓存"""
+        cache_path = self._cache_path(path, size)
+        if (os.path.exists(cache_path) and
+                os.path.getmtime(cache_path) >= os.path.getmtime(path)):
+            image = pygame.image.load(cache_path)
+        else:
+            image = pygame.image.load(path)
+            if image.get_size() != size:
+                image = pygame.transform.smoothscale(image.convert(), size)
+            self._write_cache(image, cache_path)
+        return image.convert()
+
+    def _cache_path(self, path, size):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{stem}_{size[0]}x{size[1]}.bmp")
+
+    def _write_cache(self, image, cache_path):
+        """先写临时文件再替换，避免留下不完整的缓存"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = cache_path + '.tmp.bmp'
+            pygame.image.save(image, temp_path)
+            os.replace(temp_path, cache_path)
+        except (pygame.error, OSError) as e:
+            print(f"Warning: Could not write background cache: {e}")
+
+
+class SpriteSheetAnimation:
+    """精灵表动画：所有帧是同一张表上的子表面，不复制像素"""
+
+    def __init__(self, sheet, frame_size, frames, columns, fps):
+        self.sheet = sheet
+        self.fps = fps
+        width, height = frame_size
+        self.frames = [
+            sheet.subsurface(((i % columns) * width, (i // columns) * height,
+                              width, height))
+            for i in range(frames)
+        ]
+
+    def frame(self, time_ms):
+        """返回time_ms时刻应显示的帧"""
+        return self.frames[int(time_ms * self.fps / 1000) % len(self.frames)]
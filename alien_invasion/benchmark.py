@@ -0,0 +1,288 @@
+"""帧阶段基准测试
+
+以无头模式驱动AlienInvasion运行一组固定场景，每帧按主循环的顺序处理事件、
+推进一个模拟步并绘制，各阶段耗时取自游戏自身的帧分析器（阶段定义见
+profiler.PHASES）。结果写入JSON文件，可与保存的基线对比以发现性能回退。
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench_baseline.json
+"""
+import sys
+import json
+import random
+import argparse
+import platform
+from time import perf_counter
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from game_state import GameState
+from profiler import PHASES
+from spatial_hash import SpatialHash
+
+
+def percentile(sorted_values, pct):
+    """返回已排序序列的百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(samples):
+    """把一组耗时样本（秒）汇总为毫秒统计"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    mean = sum(ordered) / count if count else 0.0
+    return {
+        'mean': mean * 1000,
+        'p50': percentile(ordered, 50) * 1000,
+        'p95': percentile(ordered, 95) * 1000,
+        'p99': percentile(ordered, 99) * 1000,
+    }
+
+
+class Scenario:
+    """一个基准场景：setup布置初始状态，before_frame在每帧计时前注入输入
+
+    simulate为False时游戏停在重生等待状态：只有飞船和粒子推进，
+    舰队不行动（空舰队在游戏状态下会直接进入下一关）。
+    """
+
+    def __init__(self, name, setup, before_frame=None, simulate=True):
+        self.name = name
+        self.setup = setup
+        self.before_frame = before_frame
+        self.simulate = simulate
+
+
+def _setup_level(level):
+    def setup(ai):
+        ai.stats.level = level
+        ai._create_fleet()
+    return setup
+
+
+def _setup_empty(ai):
+    ai.aliens.empty()
+
+
+def _setup_bullets(ai):
+    ai.settings.bullets_allowed = 200
+    ai.settings.alien_bullets_allowed = 200
+    ai.settings.alien_fire_frequency = 0
+    ai.stats.level = 4
+    ai._create_fleet()
+
+
+def _saturate_bullets(ai):
+    ai.fire_requested = True
+
+
+def _setup_particles(ai):
+    ai.aliens.empty()
+
+
+def _keep_particles(ai, target=10000):
+    width = ai.settings.screen_width
+    height = ai.settings.screen_height
+    while ai.particle_effect.count() < target:
+        ai.particle_effect.create_explosion(
+            random.randint(0, width), random.randint(0, height), count=500)
+
+
+SCENARIOS = [
+    Scenario('empty', _setup_empty, simulate=False),
+    Scenario('level1', _setup_level(1)),
+    Scenario('level2', _setup_level(2)),
+    Scenario('level3', _setup_level(3)),
+    Scenario('level4', _setup_level(4)),
+    Scenario('bullets', _setup_bullets, _saturate_bullets),
+    Scenario('particles', _setup_particles, _keep_particles, simulate=False),
+]
+
+
+def run_scenario(ai, scenario, frames, warmup, seed):
+    """运行单个场景，返回每个阶段的统计"""
+    random.seed(seed)
+    saved_settings = dict(vars(ai.settings))
+    ai.menu.start_game(seed)
+    ai.settings.initialize_dynamic_settings()
+    scenario.setup(ai)
+    if not scenario.simulate:
+        ai.set_state(GameState.RESPAWNING)
+        ai.respawn_time = float('inf')
+
+    profiler = ai.profiler
+    timings = {phase: [] for phase in PHASES}
+    timings['frame'] = []
+
+    for frame in range(warmup + frames):
+        # 保持飞船存活，避免死亡动画干扰计时
+        ai.ship.reset_shield()
+        if scenario.before_frame:
+            scenario.before_frame(ai)
+
+        # 与run_game中的一帧相同，固定推进一个模拟步
+        profiler.begin_frame()
+        ai._check_events()
+        profiler.mark('events')
+        ai._update_game()
+        ai.interpolation = 1.0
+        ai._update_screen()
+        profiler.end_frame()
+
+        if frame < warmup:
+            continue
+        for phase, elapsed in profiler.last_frame().items():
+            timings[phase].append(elapsed / 1000)
+
+    vars(ai.settings).update(saved_settings)
+    return {name: summarize(samples) for name, samples in timings.items()}
+
+
+def run_benchmarks(frames=600, warmup=60, seed=2077, only=None,
+                   dirty_rects=False):
+    """运行全部（或指定的）场景，返回可序列化为JSON的结果"""
+    ai = AlienInvasion(headless=True, persist=False)
+    ai.settings.dirty_rect_rendering = dirty_rects
+    ai.profiler.set_capture(True)
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'frames': frames,
+            'warmup': warmup,
+            'seed': seed,
+            'dirty_rects': dirty_rects,
+        },
+        'scenarios': {},
+        'pools': {},
+    }
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        results['scenarios'][scenario.name] = run_scenario(
+            ai, scenario, frames, warmup, seed)
+        results['pools'][scenario.name] = ai.pool_stats()
+    return results
+
+
+def _random_group(count, size, bounds, rng):
+    """生成count个随机分布的矩形精灵"""
+    group = pygame.sprite.Group()
+    width, height = bounds
+    for _ in range(count):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(0, width - size[0]),
+                                  rng.randint(0, height - size[1]), *size)
+        group.add(sprite)
+    return group
+
+
+def collision_scaling(aliens=1000, bullets=500, repeats=50, seed=2077):
+    """对比pygame.sprite.groupcollide与空间哈希在大规模下的耗时"""
+    rng = random.Random(seed)
+    bounds = (1200, 800)
+    alien_size, bullet_size = (60, 58), (3, 15)
+    alien_group = _random_group(aliens, alien_size, bounds, rng)
+    bullet_group = _random_group(bullets, bullet_size, bounds, rng)
+    grid = SpatialHash(max(alien_size + bullet_size))
+
+    # 结果必须与groupcollide一致
+    expected = pygame.sprite.groupcollide(bullet_group, alien_group,
+                                          False, False)
+    actual = grid.groupcollide(bullet_group, alien_group, False, False)
+    assert ({k: set(v) for k, v in expected.items()}
+            == {k: set(v) for k, v in actual.items()})
+
+    timings = {'groupcollide': [], 'spatial_hash': []}
+    for _ in range(repeats):
+        start = perf_counter()
+        pygame.sprite.groupcollide(bullet_group, alien_group, False, False)
+        middle = perf_counter()
+        grid.groupcollide(bullet_group, alien_group, False, False)
+        end = perf_counter()
+        timings['groupcollide'].append(middle - start)
+        timings['spatial_hash'].append(end - middle)
+
+    result = {name: summarize(samples) for name, samples in timings.items()}
+    result['aliens'] = aliens
+    result['bullets'] = bullets
+    return result
+
+
+def compare(results, baseline, threshold):
+    """与基线比较各阶段的p50，返回超过阈值的回退列表"""
+    regressions = []
+    for name, phases in results['scenarios'].items():
+        base_phases = baseline.get('scenarios', {}).get(name)
+        if not base_phases:
+            continue
+        for phase, stats in phases.items():
+            base = base_phases.get(phase)
+            # 忽略极小的阶段，避免计时噪声误报
+            if not base or base['p50'] < 0.01:
+                continue
+            ratio = stats['p50'] / base['p50']
+            if ratio > 1 + threshold:
+                regressions.append((name, phase, base['p50'], stats['p50']))
+    return regressions
+
+
+def print_report(results):
+    """以表格形式打印结果"""
+    for name, phases in results['scenarios'].items():
+        print(f"\n[{name}]")
+        print(f"  {'phase':<14}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+        for phase in PHASES + ['frame']:
+            stats = phases[phase]
+            print(f"  {phase:<14}{stats['mean']:>9.3f}{stats['p50']:>9.3f}"
+                  f"{stats['p95']:>9.3f}{stats['p99']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 帧阶段基准测试")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--warmup', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=2077)
+    parser.add_argument('--scenario', action='append',
+                        help="只运行指定场景，可重复")
+    parser.add_argument('--collisions', action='store_true',
+                        help="同时运行1000外星人×500子弹的碰撞检测对比")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="使用脏矩形渲染模式")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="用于对比的基线JSON文件")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="允许的p50相对增长，超过则视为回退")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.frames, args.warmup, args.seed,
+                             args.scenario, args.dirty_rects)
+    print_report(results)
+    if args.collisions:
+        results['collisions'] = collision_scaling()
+        for name in ('groupcollide', 'spatial_hash'):
+            stats = results['collisions'][name]
+            print(f"  {name:<14}{stats['mean']:>9.3f}{stats['p50']:>9.3f}"
+                  f"{stats['p95']:>9.3f}{stats['p99']:>9.3f}  (ms)")
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, phase, before, after in regressions:
+            print(f"回退: {name}/{phase} p50 {before:.3f}ms -> {after:.3f}ms")
+        if regressions:
+            sys.exit(1)
+        print("未发现性能回退")
+
+
+if __name__ == '__main__':
+    main()
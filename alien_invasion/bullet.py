@@ -15,7 +15,11 @@ class Bullet(Sprite):
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
                                 self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.reset(ai_game.ship)
+
+    def reset(self, ship):
+        """Place the bullet at the ship's current position (used when recycled)."""
+        self.rect.midtop = ship.rect.midtop
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
@@ -13,7 +13,7 @@ class Button:
         self.width, self.height = 200, 50
         self.button_color = (0, 135, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.text.font(None, 48)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -29,15 +29,7 @@ class Button:
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
-    def draw_button(self, screen, offset=(0, 0)):
+    def draw_button(self, screen):
         """Draw blank button and then draw message."""
-        offset_x, offset_y = offset
-        temp_rect = self.rect.copy()
-        temp_rect.x += offset_x
-        temp_rect.y += offset_y
-        screen.fill(self.button_color, temp_rect)
-        
-        temp_msg_rect = self.msg_image_rect.copy()
-        temp_msg_rect.x += offset_x
-        temp_msg_rect.y += offset_y
-        screen.blit(self.msg_image, temp_msg_rect)
\ No newline at end of file
+        screen.fill(self.button_color, self.rect)
+        screen.blit(self.msg_image, self.msg_image_rect)
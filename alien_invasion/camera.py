@@ -0,0 +1,64 @@
+import random
+
+import pygame
+
+
+class Camera:
+    """摄像机：决定世界层画到哪里，以及屏幕抖动
+
+    游戏元素总是按世界坐标绘制。不抖动时世界层就是屏幕本身，没有任何额外开销；
+    抖动时先画到一个离屏的世界层，提交时整体平移一次，
+    抖动的代价与元素数量无关。
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.layer = None
+        self.offset = (0, 0)
+        # 本帧是否画在离屏世界层上
+        self.using_layer = False
+
+        # 剩余的抖动模拟步数和抖动强度（像素）
+        self.shake_steps = 0
+        self.shake_intensity = 0
+
+    def shake(self, steps, intensity):
+        """开始持续steps个模拟步的抖动"""
+        self.shake_steps = steps
+        self.shake_intensity = intensity
+
+    def stop_shake(self):
+        self.shake_steps = 0
+
+    @property
+    def shaking(self):
+        return self.shake_steps > 0
+
+    def update(self):
+        """每个模拟步调用一次，抖动逐步衰减"""
+        if self.shake_steps > 0:
+            self.shake_steps -= 1
+
+    def begin(self):
+        """开始绘制一帧世界，返回绘制目标（屏幕或离屏世界层）"""
+        self.using_layer = self.shaking
+        if not self.using_layer:
+            self.offset = (0, 0)
+            return self.screen
+
+        if self.layer is None:
+            # 只在第一次抖动时创建，与屏幕像素格式一致以便快速blit
+            self.layer = pygame.Surface(self.screen.get_size()).convert(
+                self.screen)
+        # 抖动只影响画面，使用全局随机数，不消耗模拟的随机序列
+        intensity = self.shake_intensity
+        self.offset = (random.randint(-intensity, intensity),
+                       random.randint(-intensity, intensity))
+        return self.layer
+
+    def present(self, fill_color):
+        """把世界层按抖动偏移提交到屏幕，露出的边缘用fill_color填充"""
+        if not self.using_layer:
+            return
+        self.screen.fill(fill_color)
+        self.screen.blit(self.layer, self.offset)
@@ -0,0 +1,230 @@
+import pygame
+
+from spatial_hash import SpatialHash
+
+
+class Fleet(pygame.sprite.Group):
+    """外星人舰队
+
+    外星人的矩形保存在编队坐标中，舰队作为一个整体按共享偏移移动：
+    移动只改变偏移，绘制和碰撞检测时再加上偏移，移动的代价不随外星人数量增长。
+    同时维护编队的包围盒（左、右、下边界），边缘检测和触底检测都是常数时间。
+    编队坐标下的碰撞网格在外星人加入和被击落时增量更新，不需要每步重建。
+    """
+
+    def __init__(self, ai_game):
+        super().__init__()
+        self.settings = ai_game.settings
+        self.rng = ai_game.rng
+        self.screen_rect = ai_game.screen.get_rect()
+
+        # 舰队整体的水平偏移（浮点）和下移量，以及当前生效的整数偏移
+        self.x = 0.0
+        self.y = 0
+        self.applied_x = 0
+        self.applied_y = 0
+        # 上一个模拟步开始时的偏移，用于插值绘制
+        self.prev_x = 0
+        self.prev_y = 0
+
+        # 编队坐标（去掉偏移）中各边界值出现的次数，用于在击落时维护包围盒
+        self._lefts = {}
+        self._rights = {}
+        self._bottoms = {}
+        self._min_left = None
+        self._max_right = None
+        self._max_bottom = None
+
+        # 编队坐标下的碰撞粗筛网格，格子大小取外星人和子弹中较大的边长
+        alien_width, alien_height = ai_game.assets.image_size(
+            self.settings.alien_image)
+        self.grid = SpatialHash(max(alien_width, alien_height,
+                                    self.settings.bullet_height))
+
+        # 按列维护每列最下方的外星人（射手），射手列表支持O(1)随机选择
+        self.column_width = self.settings.alien_column_width
+        self._columns = {}
+        self._lowest = {}
+        self._shooters = []
+        self._shooter_slot = {}
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        # 加入时给出的是屏幕坐标，转换为编队坐标
+        rect = sprite.rect
+        rect.move_ip(-self.applied_x, -self.applied_y)
+        left, right, bottom = rect.left, rect.right, rect.bottom
+        self.grid.insert(sprite)
+        column = (left + right) // 2 // self.column_width
+        sprite.fleet_column = column
+        self._add_to_column(sprite, column, bottom)
+
+        self._lefts[left] = self._lefts.get(left, 0) + 1
+        self._rights[right] = self._rights.get(right, 0) + 1
+        self._bottoms[bottom] = self._bottoms.get(bottom, 0) + 1
+        if self._min_left is None or left < self._min_left:
+            self._min_left = left
+        if self._max_right is None or right > self._max_right:
+            self._max_right = right
+        if self._max_bottom is None or bottom > self._max_bottom:
+            self._max_bottom = bottom
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        rect = sprite.rect
+        left, right, bottom = rect.left, rect.right, rect.bottom
+        self.grid.remove(sprite)
+        self._remove_from_column(sprite, sprite.fleet_column)
+        if self._discount(self._lefts, left) and left == self._min_left:
+            self._min_left = min(self._lefts, default=None)
+        if self._discount(self._rights, right) and right == self._max_right:
+            self._max_right = max(self._rights, default=None)
+        if (self._discount(self._bottoms, bottom)
+                and bottom == self._max_bottom):
+            self._max_bottom = max(self._bottoms, default=None)
+
+    def empty(self):
+        """清空舰队并重置偏移，新编队从精灵当前位置开始
+
+        偏移不在最后一个外星人被击落时重置：同一步里还要用它计算
+        被击落外星人在屏幕上的位置（爆炸效果）。
+        """
+        super().empty()
+        self.x = 0.0
+        self.y = 0
+        self.applied_x = 0
+        self.applied_y = 0
+        self.prev_x = 0
+        self.prev_y = 0
+
+    def _add_to_column(self, sprite, column, bottom):
+        """把外星人加入所在列，必要时成为该列的射手"""
+        members = self._columns.get(column)
+        if members is None:
+            self._columns[column] = [sprite]
+            self._lowest[column] = sprite
+            self._shooter_slot[sprite] = len(self._shooters)
+            self._shooters.append(sprite)
+            return
+        members.append(sprite)
+        lowest = self._lowest[column]
+        if bottom > lowest.rect.bottom:
+            self._replace_shooter(column, lowest, sprite)
+
+    def _remove_from_column(self, sprite, column):
+        """把外星人移出所在列，如果它是射手则由该列下一个最低的外星人接替"""
+        members = self._columns[column]
+        members.remove(sprite)
+        if self._lowest[column] is not sprite:
+            return
+        if members:
+            lowest = max(members, key=lambda alien: alien.rect.bottom)
+            self._replace_shooter(column, sprite, lowest)
+            return
+
+        # 该列已空：与射手列表末尾交换后删除
+        del self._columns[column]
+        del self._lowest[column]
+        slot = self._shooter_slot.pop(sprite)
+        last = self._shooters.pop()
+        if last is not sprite:
+            self._shooters[slot] = last
+            self._shooter_slot[last] = slot
+
+    def _replace_shooter(self, column, old, new):
+        """在射手列表中用new替换old"""
+        slot = self._shooter_slot.pop(old)
+        self._shooters[slot] = new
+        self._shooter_slot[new] = slot
+        self._lowest[column] = new
+
+    def random_shooter(self):
+        """从当前暴露在外的各列射手中随机选一个，没有外星人时返回None"""
+        if not self._shooters:
+            return None
+        return self.rng.choice(self._shooters)
+
+    @staticmethod
+    def _discount(counts, value):
+        """计数减一，返回该值是否已不再出现"""
+        remaining = counts[value] - 1
+        if remaining:
+            counts[value] = remaining
+            return False
+        del counts[value]
+        return True
+
+    @property
+    def offset(self):
+        """编队坐标到屏幕坐标的整数偏移"""
+        return (self.applied_x, self.applied_y)
+
+    def rect_on_screen(self, alien):
+        """外星人在屏幕上的矩形（新矩形）"""
+        return alien.rect.move(self.applied_x, self.applied_y)
+
+    def collide_rect(self, rect):
+        """返回与屏幕矩形rect相交的任一外星人，没有时返回None"""
+        hits = self.grid.query(rect.move(-self.applied_x, -self.applied_y))
+        return hits[0] if hits else None
+
+    def groupcollide(self, group, dokill, dokillself):
+        """group中的精灵（屏幕坐标）与外星人的碰撞
+
+        语义与 pygame.sprite.groupcollide(group, self, ...) 相同，
+        使用增量维护的网格，并按舰队偏移换算坐标。
+        """
+        if not group or not self.spritedict:
+            return {}
+        return self.grid.collide(group, self, dokill, dokillself, self.offset)
+
+    @property
+    def left(self):
+        """舰队最左边的屏幕坐标"""
+        return self._min_left + self.applied_x
+
+    @property
+    def right(self):
+        """舰队最右边的屏幕坐标"""
+        return self._max_right + self.applied_x
+
+    @property
+    def bottom(self):
+        """舰队最下边的屏幕坐标"""
+        return self._max_bottom + self.applied_y
+
+    def remember_position(self):
+        """在模拟步开始时记录偏移，供插值绘制使用"""
+        self.prev_x = self.applied_x
+        self.prev_y = self.applied_y
+
+    def interpolation_offset(self, back):
+        """返回绘制时编队坐标到屏幕坐标的偏移：back为从当前状态回退到上一状态的比例"""
+        return (self.applied_x + round((self.prev_x - self.applied_x) * back),
+                self.applied_y + round((self.prev_y - self.applied_y) * back))
+
+    def check_edges(self):
+        """Return True if the fleet is at an edge of the screen."""
+        if not self.spritedict:
+            return False
+        return self.right >= self.screen_rect.right or self.left <= 0
+
+    def check_bottom(self, y):
+        """Return True if any alien has reached the given y coordinate."""
+        return bool(self.spritedict) and self.bottom >= y
+
+    def change_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.y += self.settings.fleet_drop_speed
+        self.settings.fleet_direction *= -1
+        self._apply_offset()
+
+    def update(self):
+        """Move the whole fleet right or left by the shared offset."""
+        self.x += self.settings.alien_speed * self.settings.fleet_direction
+        self._apply_offset()
+
+    def _apply_offset(self):
+        """更新生效的整数偏移（外星人的矩形不动）"""
+        self.applied_x = int(self.x)
+        self.applied_y = self.y
@@ -0,0 +1,56 @@
+import json
+import os
+
+import pygame
+
+
+class FontCache:
+    """系统字体查找结果的持久化缓存
+
+    pygame.font.match_font 第一次调用时会扫描整个系统字体库（Linux上运行
+    fc-list），可能耗时数秒。查找结果（字体文件路径，找不到时为None）保存到
+    磁盘，之后启动直接读取；缓存的文件不存在时重新查找。
+    安装新字体后删除缓存文件即可重新查找。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 字体名 -> 字体文件路径（None表示系统中没有）
+        self.paths = None
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.paths = json.load(f)
+        except (OSError, ValueError):
+            self.paths = {}
+
+    def resolve(self, name):
+        """返回字体名对应的文件路径，系统中没有时返回None"""
+        if self.paths is None:
+            self._load()
+        if name in self.paths:
+            path = self.paths[name]
+            if path is None or os.path.exists(path):
+                return path
+
+        path = pygame.font.match_font(name)
+        self.paths[name] = path
+        self._dirty = True
+        self.save()
+        return path
+
+    def save(self):
+        """有新的查找结果时写回磁盘（先写临时文件再替换）"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.paths, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not write font cache: {e}")
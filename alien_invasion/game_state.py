@@ -0,0 +1,23 @@
+class GameState:
+    """游戏状态
+
+    所有状态共用 run_game 中同一个限帧主循环和事件泵，
+    状态只决定每帧推进哪些模拟、响应哪些输入、绘制什么。
+    """
+
+    MENU = 'menu'                # 主菜单（游戏未开始或已结束）
+    PLAYING = 'playing'          # 正常游戏
+    PAUSED = 'paused'            # 暂停菜单
+    DYING = 'dying'              # 飞船摧毁动画
+    RESPAWNING = 'respawning'    # 新舰队就位，短暂等待后继续
+    VICTORY = 'victory'          # 通关画面，等待按R重新开始
+
+    # 需要推进模拟时钟的状态
+    SIMULATED = frozenset((PLAYING, DYING, RESPAWNING))
+    # 游戏画面静止、可以复用快照的状态
+    FROZEN = frozenset((MENU, PAUSED, VICTORY))
+    # 每个状态下模拟步会移动的元素组（绘制时只对这些组插值）
+    MOVING = {
+        PLAYING: frozenset(('bullets', 'alien_bullets', 'aliens', 'ship')),
+        RESPAWNING: frozenset(('ship',)),
+    }
@@ -1,5 +1,7 @@
-import json
-import os
+import sqlite3
+
+from high_score_store import HighScoreStore
+from run_history import RunHistory
 
 
 class GameStats:
@@ -8,50 +10,63 @@ class GameStats:
     def __init__(self, ai_game):
         """Initialize statistics."""
         self.settings = ai_game.settings
+        # 只有真实玩家的对局写回最高分（无头模拟、回放和工具只读）
+        self.persist = ai_game.persist
         self.reset_stats()
 
+        # 对局历史（同样只记录真实玩家的对局）
+        self.history = (RunHistory(self.settings.run_history_file)
+                        if self.persist else None)
+
         # High score should never be reset.
-        self.high_score_file = 'high_score.json'
-        self._load_high_score()
+        #   Kept in memory; the store writes it in the background.
+        self.high_score_store = HighScoreStore(
+            self.settings.high_score_file,
+            self.settings.high_score_flush_interval)
+        self.high_score = self.high_score_store.high_score
 
     def reset_stats(self):
         """Initialize statistics that can change during the game."""
         self.ships_left = self.settings.ship_limit
         self.score = 0
         self.level = 1
+        self.shots_fired = 0
+
+    def save_high_score(self):
+        """把最高分交给存储，由后台线程写入磁盘"""
+        if self.persist:
+            self.high_score_store.update(self.high_score)
 
-    def _load_high_score(self):
-        """Load high score from file."""
+    def record_run(self, difficulty, duration_ms):
+        """把本局结果写入对局历史"""
+        if self.history is None:
+            return
         try:
-            if os.path.exists(self.high_score_file):
-                with open(self.high_score_file, 'r') as f:
-                    data = json.load(f) 
-                    self.high_score = data.get('high_score', 0)
-            else:
-                self.high_score = 0
-        except (json.JSONDecodeError, IOError):
-            self.high_score = 0
+            self.history.record_run(self.score, self.level, difficulty,
+                                    duration_ms, self.shots_fired)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not record run: {e}")
 
-    def save_high_score(self):
-        """Save high score to file."""
+    def top_scores(self, difficulty, limit, after=None):
+        """排行榜的一页（after为上一页最后一行），读取失败时为空"""
+        if self.history is None:
+            return []
         try:
-            # 先加载现有数据（如果有），然后更新high_score字段
-            if os.path.exists(self.high_score_file):
-                with open(self.high_score_file, 'r') as f:
-                    data = json.load(f)
-            else:
-                data = {}
-            data['high_score'] = self.high_score
-            data['save_time'] = time.time()  # 可选：更新时间戳
-
-            with open(self.high_score_file, 'w') as f:
-                json.dump(data, f)
-        except IOError:
-            print("Warning: Could not save high score")
+            return self.history.top_scores(difficulty, limit, after)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read run history: {e}")
+            return []
+
+    def close(self):
+        """退出时同步写出尚未保存的最高分"""
+        self.save_high_score()
+        self.high_score_store.close()
+        if self.history is not None:
+            self.history.close()
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
         if self.score > self.high_score:
             self.high_score = self.score
             return True
-        return False
\ No newline at end of file
+        return False
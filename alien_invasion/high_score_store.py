@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class HighScoreStore:
+    """最高分的持久化存储
+
+    启动时读取一次文件，之后游戏线程只修改内存中的副本。写入由后台线程完成：
+    短时间内的多次更新合并为一次写入，两次写入至少间隔flush_interval秒，
+    每次先写临时文件再原子替换，中途退出不会留下损坏的文件。
+    退出时调用 close 同步写出尚未保存的更新。
+    """
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.data = self._read()
+
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._closing = False
+        self._last_write = 0.0
+        # 后台线程在第一次更新时才启动
+        self._worker = None
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            print("Warning: Could not load high score")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def high_score(self):
+        return self.data.get('high_score', 0)
+
+    def update(self, high_score):
+        """记录新的最高分，由后台线程稍后写入磁盘"""
+        with self._condition:
+            if high_score == self.high_score or self._closing:
+                return
+            self.data['high_score'] = high_score
+            self.data['save_time'] = time.time()
+            self._dirty = True
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name='high-score-writer', daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def _run(self):
+        """后台线程：等待更新，合并同一间隔内的多次更新后写入"""
+        condition = self._condition
+        while True:
+            with condition:
+                while not self._dirty and not self._closing:
+                    condition.wait()
+                deadline = self._last_write + self.flush_interval
+                while not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    condition.wait(remaining)
+                if self._closing:
+                    return
+                data = dict(self.data)
+                self._dirty = False
+            self._write(data)
+            self._last_write = time.monotonic()
+
+    def _write(self, data):
+        """写临时文件后用 os.replace 原子替换"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            print("Warning: Could not save high score")
+
+    def close(self):
+        """停止后台线程，并同步写出尚未保存的更新（退出时调用）"""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+        with self._condition:
+            if not self._dirty:
+                return
+            data = dict(self.data)
+            self._dirty = False
+        self._write(data)
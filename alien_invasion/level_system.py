@@ -1,40 +1,174 @@
+import json
+import os
+
+import numpy as np
+
+
 class LevelSystem:
-    """关卡系统（空壳实现）"""
-    
+    """关卡系统
+
+    关卡定义在外部数据文件（settings.levels_file）中：阵型、速度、分数、
+    射击间隔和背景。阵型在首次使用时编译成出生位置数组并缓存，
+    数据文件修改后会在下一次加载关卡时自动重新读取。
+    """
+
     def __init__(self, ai_game):
         self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.path = self.settings.levels_file
         self.current_level = 1
-        self.max_levels = 4  # 将关卡上限改为4
-        
+
+        self.levels = []
+        self._mtime = None
+        # (关卡下标, 外星人尺寸, 屏幕宽度) -> 出生位置数组
+        self._positions = {}
+        self._load_file()
+
+    @property
+    def max_levels(self):
+        return len(self.levels)
+
+    def _load_file(self):
+        """读取关卡数据文件，清空编译缓存"""
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, encoding='utf-8') as f:
+            levels = json.load(f)['levels']
+        self.set_levels(levels)
+        self._mtime = mtime
+
+    def set_levels(self, levels):
+        """直接使用给定的关卡定义（例如程序生成的关卡），清空编译缓存"""
+        if not levels:
+            raise ValueError(f"{self.path} 中没有关卡")
+        for number, level in enumerate(levels, 1):
+            kind = level['formation']['type']
+            if kind not in FORMATIONS:
+                raise ValueError(f"第{number}关的阵型类型未知: {kind}")
+
+        self.levels = levels
+        self._positions.clear()
+
+    def reload_if_changed(self):
+        """数据文件被修改时重新读取；新文件有误时保留原来的关卡"""
+        try:
+            if os.path.getmtime(self.path) == self._mtime:
+                return False
+            self._load_file()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not reload levels: {e}")
+            return False
+        return True
+
+    def _level(self, level_number):
+        """返回关卡定义，超出范围时使用第一关"""
+        index = level_number - 1
+        if not 0 <= index < len(self.levels):
+            index = 0
+        return index, self.levels[index]
+
     def load_level(self, level_number):
         """加载指定关卡"""
+        self.reload_if_changed()
         self.current_level = level_number
-        # 根据关卡设置不同的参数
-        if level_number == 1:
-            self.ai_game.settings.alien_speed = 1.0
-            self.ai_game.settings.alien_points = 50
-        elif level_number == 2:
-            self.ai_game.settings.alien_speed = 1.2
-            self.ai_game.settings.alien_points = 75
-        elif level_number == 3:
-            self.ai_game.settings.alien_speed = 1.5
-            self.ai_game.settings.alien_points = 100
-        elif level_number == 4:
-            self.ai_game.settings.alien_speed = 1.8
-            self.ai_game.settings.alien_points = 150
-        
+        _, level = self._level(level_number)
+        self.settings.alien_speed = level['speed']
+        self.settings.alien_points = level['points']
+        if 'fire_interval' in level:
+            self.settings.alien_fire_frequency = level['fire_interval']
+
+    def spawn_positions(self, level_number):
+        """返回关卡阵型中每个外星人左上角坐标的 (N, 2) 整数数组（已缓存）"""
+        index, level = self._level(level_number)
+        alien_size = self.ai_game.assets.image_size(self.settings.alien_image)
+        key = (index, alien_size, self.settings.screen_width)
+        positions = self._positions.get(key)
+        if positions is None:
+            formation = level['formation']
+            compile_formation = FORMATIONS[formation['type']]
+            positions = compile_formation(formation, alien_size,
+                                          self.settings.screen_width)
+            self._positions[key] = positions
+        return positions
+
+    def background_index(self, level_number):
+        """关卡使用的背景序号（默认与关卡顺序一致）"""
+        index, level = self._level(level_number)
+        return level.get('background', index)
+
     def next_level(self):
-        """进入下一关（空壳实现）"""
+        """进入下一关"""
         if self.current_level < self.max_levels:
             self.current_level += 1
             self.load_level(self.current_level)
             return True
         return False
-    
+
     def get_level_info(self):
-        """获取当前关卡信息（空壳实现）"""
+        """获取当前关卡信息"""
+        _, level = self._level(self.current_level)
         return {
             "level": self.current_level,
-            "name": f"第{self.current_level}关",
-            "description": "关卡描述待添加"
-        }
\ No newline at end of file
+            "name": level.get('name', f"第{self.current_level}关"),
+            "description": level.get('description', ""),
+            "aliens": len(self.spawn_positions(self.current_level)),
+        }
+
+
+def _compile_grid(formation, alien_size, screen_width):
+    """矩形方阵：rows行cols列，间距为spacing倍外星人尺寸
+
+    copies/copy_offset把整个方阵复制若干份并逐份平移，
+    row_shift让偶数行右移、奇数行左移，形成波浪。
+    """
+    alien_width, alien_height = alien_size
+    spacing = formation.get('spacing', 2)
+    rows, cols = np.meshgrid(np.arange(formation['rows']),
+                             np.arange(formation['cols']), indexing='ij')
+    x = alien_width + spacing * alien_width * cols
+    y = alien_height + spacing * alien_height * rows
+    shift = formation.get('row_shift', 0)
+    if shift:
+        x = x + np.where(rows % 2 == 0, shift, -shift)
+
+    grid = np.stack([x.ravel(), y.ravel()], axis=1)
+    copies = formation.get('copies', 1)
+    offset = np.array(formation.get('copy_offset', (0, 0)))
+    return np.concatenate([grid + offset * copy
+                           for copy in range(copies)]).astype(np.int32)
+
+
+def _compile_rows_centered(formation, alien_size, screen_width):
+    """逐行居中：pattern给出每行外星人的数量"""
+    alien_width, alien_height = alien_size
+    spacing = formation.get('spacing', 2)
+    counts = np.array(formation['pattern'])
+    rows = np.repeat(np.arange(len(counts)), counts)
+    # 每个外星人在所在行中的列号
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    cols = np.arange(counts.sum()) - starts
+    row_counts = counts[rows]
+    x = ((screen_width - row_counts * spacing * alien_width) // 2
+         + spacing * alien_width * cols)
+    y = alien_height + spacing * alien_height * rows
+    return np.stack([x, y], axis=1).astype(np.int32)
+
+
+def _compile_ascii(formation, alien_size, screen_width):
+    """字符画：rows为字符串列表，非空格、非'.'的字符处放置外星人"""
+    alien_width, alien_height = alien_size
+    spacing = formation.get('spacing', 2)
+    lines = formation['rows']
+    width = max(len(line) for line in lines)
+    chars = np.array([list(line.ljust(width)) for line in lines])
+    rows, cols = np.nonzero((chars != ' ') & (chars != '.'))
+    x = alien_width + spacing * alien_width * cols
+    y = alien_height + spacing * alien_height * rows
+    return np.stack([x, y], axis=1).astype(np.int32)
+
+
+# 阵型类型 -> 编译函数
+FORMATIONS = {
+    'grid': _compile_grid,
+    'rows_centered': _compile_rows_centered,
+    'ascii': _compile_ascii,
+}
\ No newline at end of file
@@ -1,6 +1,8 @@
 import pygame
 import os
 
+from game_state import GameState
+
 class Menu:
     """游戏菜单系统"""
     
@@ -9,25 +11,28 @@ class Menu:
         self.screen = ai_game.screen
         self.settings = ai_game.settings
         self.stats = ai_game.stats
+        self.text = ai_game.text
         self.screen_rect = self.screen.get_rect()
         
         # 菜单状态
-        self.active_menu = "main"  # main, pause, settings, difficulty
+        self.active_menu = "main"  # main, pause, settings, difficulty, leaderboard
         self.selected_option = 0
         
         # 字体设置
         self._load_fonts()
         
         # 菜单选项
-        self.main_menu_options = ["开始游戏", "难度设置", "游戏设置", "退出游戏"]
+        self.main_menu_options = ["开始游戏", "难度设置", "游戏设置", "排行榜", "退出游戏"]
         self.pause_menu_options = ["继续游戏", "游戏设置", "返回主菜单", "退出游戏"]
         self.settings_options = ["音乐音量", "音效音量", "显示FPS", "返回"]
         self.difficulty_options = ["简单", "普通", "困难", "返回"]
+        self.leaderboard_options = ["上一页", "下一页", "返回"]
         
         # 设置值
         self.music_volume = 80
         self.sound_volume = 80
         self.show_fps = True
+        ai_game.audio.set_volume(self.sound_volume / 100)
         
         # 难度设置
         self.difficulty_level = 1  # 0:简单, 1:普通, 2:困难
@@ -40,6 +45,15 @@ class Menu:
         
         # 选项矩形列表
         self.option_rects = []
+
+        # 排行榜：当前页的行，以及每一页开始处的游标（上一页最后一行）
+        self.leaderboard_rows = []
+        self.leaderboard_cursors = [None]
+        self.leaderboard_has_next = False
+
+        # 缓存的菜单覆盖层及其对应的菜单状态
+        self._overlay = None
+        self._overlay_key = None
         
     def _load_fonts(self):
         """加载字体，优先使用系统中文字体"""
@@ -49,26 +63,21 @@ class Menu:
         self.option_font = None
         self.small_font = None
         
-        # 尝试加载系统中文字体
+        # 尝试加载系统中文字体（查找结果有磁盘缓存）
         for font_name in chinese_fonts:
-            try:
-                self.title_font = pygame.font.SysFont(font_name, 72)
-                self.option_font = pygame.font.SysFont(font_name, 48)
-                self.small_font = pygame.font.SysFont(font_name, 36)
-                
-                # 测试字体是否支持中文
-                test_surface = self.title_font.render("测试", True, (255, 255, 255))
-                if test_surface.get_width() > 0:
-                    print(f"使用字体: {font_name}")
-                    break
-            except:
+            if self.text.font_path(font_name) is None:
                 continue
+            self.title_font = self.text.font(font_name, 72)
+            self.option_font = self.text.font(font_name, 48)
+            self.small_font = self.text.font(font_name, 36)
+            print(f"使用字体: {font_name}")
+            break
         
         # 如果系统中文字体都不可用，使用默认字体
         if self.title_font is None:
-            self.title_font = pygame.font.SysFont(None, 72)
-            self.option_font = pygame.font.SysFont(None, 48)
-            self.small_font = pygame.font.SysFont(None, 36)
+            self.title_font = self.text.font(None, 72)
+            self.option_font = self.text.font(None, 48)
+            self.small_font = self.text.font(None, 36)
             print("使用默认字体")
             
             # 将菜单文本改为英文
@@ -76,6 +85,7 @@ class Menu:
             self.pause_menu_options = ["Resume", "Settings", "Main Menu", "Quit"]
             self.settings_options = ["Music Volume", "Sound Volume", "Show FPS", "Back"]
             self.difficulty_options = ["Easy", "Normal", "Hard", "Back"]
+            self.leaderboard_options = ["Previous", "Next", "Back"]
         
     def handle_events(self, event):
         """处理菜单事件"""
@@ -93,6 +103,11 @@ class Menu:
             # 设置调整 - 支持方向键和AD键
             elif event.key in [pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d] and self.active_menu == "settings":
                 self.adjust_setting(event.key)
+            # 排行榜翻页 - 支持方向键和AD键
+            elif event.key in [pygame.K_LEFT, pygame.K_a] and self.active_menu == "leaderboard":
+                self.previous_leaderboard_page()
+            elif event.key in [pygame.K_RIGHT, pygame.K_d] and self.active_menu == "leaderboard":
+                self.next_leaderboard_page()
                 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # 左键点击
             mouse_pos = pygame.mouse.get_pos()
@@ -122,6 +137,7 @@ class Menu:
                 self.sound_volume = max(0, self.sound_volume - 10)
             else:
                 self.sound_volume = min(100, self.sound_volume + 10)
+            self.ai_game.audio.set_volume(self.sound_volume / 100)
         elif self.selected_option == 2:  # 显示FPS
             self.show_fps = not self.show_fps
     
@@ -142,15 +158,17 @@ class Menu:
             elif selected in ["游戏设置", "Settings"]:
                 self.active_menu = "settings"
                 self.selected_option = 0
+            elif selected in ["排行榜", "Leaderboard"]:
+                self.active_menu = "leaderboard"
+                self.selected_option = 1
+                self.open_leaderboard()
             elif selected in ["退出游戏", "Quit"]:
                 pygame.quit()
                 exit()
                 
         elif self.active_menu == "pause":
             if selected in ["继续游戏", "Resume"]:
-                self.ai_game.game_active = True
-                self.ai_game.game_paused = False
-                pygame.mouse.set_visible(False)
+                self.ai_game.set_state(GameState.PLAYING)
             elif selected in ["游戏设置", "Settings"]:
                 self.active_menu = "settings"
                 self.selected_option = 0
@@ -162,7 +180,7 @@ class Menu:
                 
         elif self.active_menu == "settings":
             if selected in ["返回", "Back"]:
-                if self.ai_game.game_active and self.ai_game.game_paused:
+                if self.ai_game.state == GameState.PAUSED:
                     self.active_menu = "pause"
                 else:
                     self.active_menu = "main"
@@ -170,7 +188,7 @@ class Menu:
                 
         elif self.active_menu == "difficulty":
             if selected in ["返回", "Back"]:
-                if self.ai_game.game_active and self.ai_game.game_paused:
+                if self.ai_game.state == GameState.PAUSED:
                     self.active_menu = "pause"
                     self.selected_option = 1
                 else:
@@ -185,6 +203,39 @@ class Menu:
                 elif selected in ["困难", "Hard"]:
                     self.difficulty_level = 2
                 self.apply_difficulty()
+
+        elif self.active_menu == "leaderboard":
+            if selected in ["上一页", "Previous"]:
+                self.previous_leaderboard_page()
+            elif selected in ["下一页", "Next"]:
+                self.next_leaderboard_page()
+            elif selected in ["返回", "Back"]:
+                self.active_menu = "main"
+                self.selected_option = 3
+
+    def open_leaderboard(self):
+        """打开排行榜：从当前难度的第一页开始（每次打开都重新读取）"""
+        self.leaderboard_cursors = [None]
+        self._load_leaderboard_page()
+
+    def next_leaderboard_page(self):
+        if self.leaderboard_has_next:
+            self.leaderboard_cursors.append(self.leaderboard_rows[-1])
+            self._load_leaderboard_page()
+
+    def previous_leaderboard_page(self):
+        if len(self.leaderboard_cursors) > 1:
+            self.leaderboard_cursors.pop()
+            self._load_leaderboard_page()
+
+    def _load_leaderboard_page(self):
+        """从索引读取一页（多读一行用来判断是否还有下一页）"""
+        page_size = self.settings.leaderboard_page_size
+        rows = self.stats.top_scores(self.difficulty_level, page_size + 1,
+                                     self.leaderboard_cursors[-1])
+        self.leaderboard_has_next = len(rows) > page_size
+        self.leaderboard_rows = rows[:page_size]
+        self.invalidate()
     
     def get_current_options(self):
         """获取当前菜单选项"""
@@ -196,40 +247,44 @@ class Menu:
             return self.settings_options
         elif self.active_menu == "difficulty":
             return self.difficulty_options
+        elif self.active_menu == "leaderboard":
+            return self.leaderboard_options
         return []
     
-    def start_game(self):
-        """开始游戏"""
-        self.ai_game.game_active = True
-        self.ai_game.game_paused = False
+    def start_game(self, seed=None):
+        """开始游戏（seed为本局模拟随机数种子，None时按游戏设置选择）"""
         self.ai_game.stats.reset_stats()
         self.ai_game.sb.prep_score()
         self.ai_game.sb.prep_level()
         self.ai_game.sb.prep_ships()
         
         # 清空所有对象
-        self.ai_game.bullets.empty()
+        self.ai_game._clear_bullets()
         self.ai_game.aliens.empty()
-        self.ai_game.alien_bullets.empty()
+        
+        # 重置动态设置后应用难度设置，再加载第一关的关卡数据
+        #   （关卡数据文件修改过时在这里重新读取）
+        self.settings.initialize_dynamic_settings()
+        self.apply_difficulty()
+        self.ai_game.level_system.load_level(1)
         
         # 创建新舰队并居中飞船
         self.ai_game._create_fleet()
         self.ai_game.ship.center_ship()
         self.ai_game.ship.reset_shield()
         
-        # 隐藏鼠标
-        pygame.mouse.set_visible(False)
-        
-        # 应用难度设置
-        self.apply_difficulty()
+        # 进入游戏状态（同时隐藏鼠标）
+        self.ai_game.set_state(GameState.PLAYING)
+
+        # 重新播种并把模拟时钟归零
+        self.ai_game._reset_simulation(seed)
     
     def return_to_main_menu(self):
         """返回主菜单"""
-        self.ai_game.game_active = False
-        self.ai_game.game_paused = False
+        self.ai_game._end_run()
         self.active_menu = "main"
         self.selected_option = 0
-        pygame.mouse.set_visible(True)
+        self.ai_game.set_state(GameState.MENU)
     
     def apply_difficulty(self):
         """应用难度设置"""
@@ -271,12 +326,29 @@ class Menu:
         self.animation_progress = 0
         self.last_animation_time = pygame.time.get_ticks()
     
+    def invalidate(self):
+        """强制下次绘制时重新合成菜单覆盖层"""
+        self._overlay = None
+
+    def _overlay_state(self):
+        """决定菜单外观的全部状态，任一变化都需要重新合成覆盖层"""
+        return (self.active_menu, self.selected_option, self.music_volume,
+                self.sound_volume, self.show_fps, self.difficulty_level,
+                self.main_menu_options[0], len(self.leaderboard_cursors))
+
     def draw(self, screen):
-        """绘制菜单"""
+        """绘制菜单，覆盖层缓存起来，只在菜单状态变化时重新合成"""
+        state = self._overlay_state()
+        if self._overlay is None or state != self._overlay_key:
+            self._overlay = self._compose_overlay()
+            self._overlay_key = state
+        screen.blit(self._overlay, (0, 0))
+
+    def _compose_overlay(self):
+        """合成半透明背景、标题、选项、选择指示器和操作提示"""
         # 半透明背景
-        s = pygame.Surface((self.screen_rect.width, self.screen_rect.height), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 180))
-        screen.blit(s, (0, 0))
+        overlay = pygame.Surface((self.screen_rect.width, self.screen_rect.height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
         
         # 绘制标题
         if self.active_menu == "main":
@@ -287,14 +359,20 @@ class Menu:
             title_text = "游戏设置" if self.settings_options[0] == "音乐音量" else "Settings"
         elif self.active_menu == "difficulty":
             title_text = "难度设置" if self.difficulty_options[0] == "简单" else "Difficulty"
+        elif self.active_menu == "leaderboard":
+            title_text = "排行榜" if self.leaderboard_options[0] == "上一页" else "Leaderboard"
         else:
             title_text = "Menu"
             
-        title = self.title_font.render(title_text, True, (255, 255, 255))
+        title = self.text.render(self.title_font, title_text, (255, 255, 255))
         title_rect = title.get_rect(center=(self.screen_rect.centerx, 150))
-        screen.blit(title, title_rect)
+        overlay.blit(title, title_rect)
         
-        # 绘制选项
+        # 绘制选项（排行榜的选项放在表格下方）
+        options_top = 300
+        if self.active_menu == "leaderboard":
+            self._draw_leaderboard(overlay)
+            options_top = 580
         self.option_rects = []  # 重置选项矩形列表
         options = self.get_current_options()
         for i, option in enumerate(options):
@@ -321,27 +399,64 @@ class Menu:
             else:
                 text = option
                 
-            option_text = self.option_font.render(text, True, color)
-            option_rect = option_text.get_rect(center=(self.screen_rect.centerx, 300 + i * 60))
-            screen.blit(option_text, option_rect)
+            option_text = self.text.render(self.option_font, text, color)
+            option_rect = option_text.get_rect(center=(self.screen_rect.centerx, options_top + i * 60))
+            overlay.blit(option_text, option_rect)
             
             # 保存选项矩形用于点击检测
             self.option_rects.append(option_rect)
             
             # 绘制选择指示器
             if i == self.selected_option:
-                pygame.draw.polygon(screen, (255, 215, 0), [
+                pygame.draw.polygon(overlay, (255, 215, 0), [
                     (option_rect.left - 30, option_rect.centery),
                     (option_rect.left - 10, option_rect.centery - 10),
                     (option_rect.left - 10, option_rect.centery + 10)
                 ])
         
         # 绘制操作提示
-        if self.active_menu == "settings":
+        if self.active_menu == "leaderboard":
+            hint_text = "使用左右方向键或AD键翻页" if options[0] == "上一页" else "Use Left/Right or A/D to change page"
+        elif self.active_menu == "settings":
             hint_text = "使用左右方向键或AD键调整设置" if options[0] == "音乐音量" else "Use Left/Right or A/D to adjust"
         else:
             hint_text = "使用方向键或WS键选择，回车或空格确认" if (hasattr(self, 'main_menu_options') and self.main_menu_options[0] == "开始游戏") else "Use Arrow Keys or W/S to navigate, Enter/Space to select"
         
-        hint = self.small_font.render(hint_text, True, (200, 200, 200))
+        hint = self.text.render(self.small_font, hint_text, (200, 200, 200))
         hint_rect = hint.get_rect(center=(self.screen_rect.centerx, self.screen_rect.height - 50))
-        screen.blit(hint, hint_rect)
\ No newline at end of file
+        overlay.blit(hint, hint_rect)
+
+        return overlay
+
+    def _draw_leaderboard(self, overlay):
+        """绘制排行榜当前页：名次、得分、关卡、时长和射击次数"""
+        chinese = self.leaderboard_options[0] == "上一页"
+        difficulty = self.difficulty_options[self.difficulty_level]
+        page = len(self.leaderboard_cursors)
+        header = (f"{difficulty}  第{page}页" if chinese
+                  else f"{difficulty}  Page {page}")
+        header_image = self.text.render(self.small_font, header, (200, 200, 200))
+        overlay.blit(header_image, header_image.get_rect(
+            center=(self.screen_rect.centerx, 215)))
+
+        if not self.leaderboard_rows:
+            empty = "暂无记录" if chinese else "No runs yet"
+            empty_image = self.text.render(self.small_font, empty, (200, 200, 200))
+            overlay.blit(empty_image, empty_image.get_rect(
+                center=(self.screen_rect.centerx, 300)))
+            return
+
+        first_rank = (page - 1) * self.settings.leaderboard_page_size + 1
+        for i, row in enumerate(self.leaderboard_rows):
+            seconds = row['duration_ms'] // 1000
+            duration = f"{seconds // 60}:{seconds % 60:02d}"
+            if chinese:
+                line = (f"{first_rank + i:>2}. {row['score']:>8,}  第{row['level']}关"
+                        f"  {duration}  射击{row['shots_fired']}次")
+            else:
+                line = (f"{first_rank + i:>2}. {row['score']:>8,}  Level {row['level']}"
+                        f"  {duration}  {row['shots_fired']} shots")
+            # 数值各不相同，不放进共享的文字缓存
+            image = self.small_font.render(line, True, (255, 255, 255))
+            overlay.blit(image, image.get_rect(
+                midleft=(self.screen_rect.centerx - 260, 260 + i * 36)))
\ No newline at end of file
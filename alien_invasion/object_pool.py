@@ -0,0 +1,56 @@
+class ObjectPool:
+    """对象池：用空闲列表回收短生命周期的对象，避免频繁创建和GC停顿"""
+
+    def __init__(self, factory, capacity=0):
+        self.factory = factory
+        self.free = []
+
+        # 统计：命中（复用空闲对象）、未命中（新建对象）、同时使用的峰值
+        self.hits = 0
+        self.misses = 0
+        self.in_use = 0
+        self.high_water = 0
+
+        # 预热
+        for _ in range(capacity):
+            obj = factory()
+            obj.in_pool = True
+            self.free.append(obj)
+
+    def acquire(self):
+        """取出一个对象，空闲列表为空时才新建"""
+        if self.free:
+            obj = self.free.pop()
+            self.hits += 1
+        else:
+            obj = self.factory()
+            self.misses += 1
+        obj.in_pool = False
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """归还对象（重复归还会被忽略）"""
+        if getattr(obj, 'in_pool', False):
+            return
+        obj.in_pool = True
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def release_group(self, group):
+        """把精灵组中的所有精灵归还到池中并清空该组"""
+        for sprite in group.sprites():
+            self.release(sprite)
+        group.empty()
+
+    def stats(self):
+        """返回池的统计信息"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
+        }
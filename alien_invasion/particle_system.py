@@ -1,91 +1,224 @@
+import math
+
+import numpy as np
 import pygame
-import random
-from pygame.sprite import Sprite
-
-class Particle(Sprite):
-    """单个粒子类"""
-    def __init__(self, x, y, color, speed_range, size_range, lifetime_range):
-        super().__init__()
-        self.x = x
-        self.y = y
-        self.color = color
-        self.speed = random.uniform(speed_range[0], speed_range[1])
-        self.direction = random.uniform(0, 2 * 3.14159)  # 随机方向
-        self.size = random.uniform(size_range[0], size_range[1])
-        self.lifetime = random.uniform(lifetime_range[0], lifetime_range[1])
-        self.max_lifetime = self.lifetime
-        
-        # 创建粒子表面
-        self.image = pygame.Surface((int(self.size*2), int(self.size*2)), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (int(self.size), int(self.size)), int(self.size))
-        self.rect = self.image.get_rect(center=(x, y))
-    
-    def update(self):
-        """更新粒子状态"""
-        self.lifetime -= 1
-        if self.lifetime <= 0:
-            return False  # 粒子死亡
-        
-        # 移动粒子
-        self.x += self.speed * pygame.math.Vector2(1, 0).rotate(self.direction * 180/3.14159).x
-        self.y += self.speed * pygame.math.Vector2(1, 0).rotate(self.direction * 180/3.14159).y
-        
-        # 根据生命周期调整透明度
-        alpha = int(255 * (self.lifetime / self.max_lifetime))
-        self.image.set_alpha(alpha)
-        
-        # 更新位置
-        self.rect.center = (int(self.x), int(self.y))
-        
-        return True  # 粒子存活
+
+
+# 各种效果的参数：速度范围、半径范围、寿命范围
+EFFECT_PRESETS = {
+    'explosion': {'speed_range': (1, 5), 'size_range': (1, 4),
+                  'lifetime_range': (10, 40)},
+    'sparkle': {'speed_range': (0.5, 2), 'size_range': (1, 2),
+                'lifetime_range': (5, 20)},
+    'shield_hit': {'speed_range': (0.5, 2), 'size_range': (1, 3),
+                   'lifetime_range': (10, 30)},
+}
+
+# 预渲染图集中的颜色：爆炸黄、飞船爆炸橙、护盾蓝、火花白
+ATLAS_COLORS = [(255, 200, 0), (255, 100, 0), (100, 200, 255),
+                (255, 255, 255)]
+
+# 透明度量化级数
+ALPHA_LEVELS = 16
+
 
 class ParticleEffect:
-    """粒子效果管理器"""
-    def __init__(self):
-        self.particles = pygame.sprite.Group()
-    
+    """粒子效果管理器
+
+    所有粒子的位置、速度、寿命、半径和颜色保存在连续的NumPy数组中，
+    每帧用少量向量化运算完成积分和剔除，不再为每个粒子创建精灵和表面。
+    """
+    def __init__(self, capacity=1024, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.active = 0
+
+        # 粒子槽位即对象池：统计复用的槽位、需要扩容的粒子和存活峰值
+        self.hits = 0
+        self.misses = 0
+        self.high_water = 0
+
+        # 颜色表：粒子只保存颜色索引
+        self.colors = []
+        self._color_index = {}
+
+        # 图集：按 (颜色, 半径, 透明度级别) 展平的共享圆形表面列表
+        self.max_radius = max(int(preset['size_range'][1])
+                              for preset in EFFECT_PRESETS.values())
+        self.atlas = []
+
+        self._allocate(capacity)
+
+    def prewarm(self):
+        """预渲染常用颜色的图集，避免第一次爆炸时卡顿（已渲染的颜色直接跳过）"""
+        for color in ATLAS_COLORS:
+            self._color_id(color)
+
+    def reseed(self, seed):
+        """重新设置随机数种子（新的一局开始时）"""
+        self.rng = np.random.default_rng(seed)
+
+    def _allocate(self, capacity):
+        """分配（或扩容）粒子数组，保留已有粒子"""
+        old_active = self.active
+        arrays = {
+            'x': np.float64, 'y': np.float64,
+            'vx': np.float64, 'vy': np.float64,
+            'life': np.float64, 'max_life': np.float64,
+            'radius': np.int32, 'color': np.int32,
+        }
+        for name, dtype in arrays.items():
+            new_array = np.zeros(capacity, dtype=dtype)
+            if old_active:
+                new_array[:old_active] = getattr(self, name)[:old_active]
+            setattr(self, name, new_array)
+        self.capacity = capacity
+
+    def _color_id(self, color):
+        """返回颜色在颜色表中的索引"""
+        color = tuple(color)
+        index = self._color_index.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self._color_index[color] = index
+            self._bake_color(color)
+        return index
+
+    def _bake_color(self, color):
+        """为一种颜色预渲染所有半径和透明度级别的圆形表面
+
+        圆内透明度均匀，用颜色键加整体透明度表示，并开启RLE加速：
+        小表面的混合比逐像素透明度快得多，结果相同。
+        """
+        convert = pygame.display.get_surface() is not None
+        # 颜色键取反色，保证与粒子颜色不同
+        key = tuple(255 - channel for channel in color)
+        for radius in range(self.max_radius + 1):
+            size = max(1, radius * 2)
+            for level in range(ALPHA_LEVELS):
+                alpha = 255 * level // (ALPHA_LEVELS - 1)
+                sprite = pygame.Surface((size, size))
+                sprite.fill(key)
+                if radius:
+                    pygame.draw.circle(sprite, color, (radius, radius),
+                                       radius)
+                if convert:
+                    sprite = sprite.convert()
+                sprite.set_colorkey(key, pygame.RLEACCEL)
+                sprite.set_alpha(alpha, pygame.RLEACCEL)
+                self.atlas.append(sprite)
+
+    def _spawn(self, x, y, color, count, speed_range, size_range,
+               lifetime_range):
+        """在 (x, y) 处一次性生成count个粒子"""
+        if count <= 0:
+            return
+        needed = self.active + count
+        if needed > self.capacity:
+            self.misses += needed - self.capacity
+            self.hits += self.capacity - self.active
+            self._allocate(max(needed, self.capacity * 2))
+        else:
+            self.hits += count
+
+        start, end = self.active, needed
+        speed = self.rng.uniform(speed_range[0], speed_range[1], count)
+        direction = self.rng.uniform(0, 2 * math.pi, count)  # 随机方向
+        life = self.rng.uniform(lifetime_range[0], lifetime_range[1], count)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = speed * np.cos(direction)
+        self.vy[start:end] = speed * np.sin(direction)
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        radius = self.rng.uniform(size_range[0], size_range[1], count)
+        self.radius[start:end] = np.clip(radius.astype(np.int32), 0,
+                                         self.max_radius)
+        self.color[start:end] = self._color_id(color)
+        self.active = end
+        if end > self.high_water:
+            self.high_water = end
+
     def create_explosion(self, x, y, color=(255, 200, 0), count=30):
         """创建爆炸效果"""
-        for _ in range(count):
-            particle = Particle(
-                x, y, 
-                color, 
-                speed_range=(1, 5),
-                size_range=(1, 4),
-                lifetime_range=(10, 40)
-            )
-            self.particles.add(particle)
-    
+        self._spawn(x, y, color, count, **EFFECT_PRESETS['explosion'])
+
     def create_sparkle(self, x, y, color=(255, 255, 255), count=15):
         """创建火花效果"""
-        for _ in range(count):
-            particle = Particle(
-                x, y,
-                color,
-                speed_range=(0.5, 2),
-                size_range=(1, 2),
-                lifetime_range=(5, 20)
-            )
-            self.particles.add(particle)
-    
+        self._spawn(x, y, color, count, **EFFECT_PRESETS['sparkle'])
+
     def create_shield_hit(self, x, y, count=20):
         """创建护盾受损效果"""
-        for _ in range(count):
-            particle = Particle(
-                x, y,
-                (100, 200, 255),  # 蓝色护盾颜色
-                speed_range=(0.5, 2),
-                size_range=(1, 3),
-                lifetime_range=(10, 30)
-            )
-            self.particles.add(particle)
-    
+        self._spawn(x, y, (100, 200, 255), count,  # 蓝色护盾颜色
+                    **EFFECT_PRESETS['shield_hit'])
+
     def update(self):
-        """更新所有粒子"""
-        for particle in self.particles.copy():
-            if not particle.update():
-                self.particles.remove(particle)
-    
-    def draw(self, screen):
-        """绘制所有粒子"""
-        self.particles.draw(screen)
\ No newline at end of file
+        """更新所有粒子：扣减寿命、剔除死亡粒子、移动存活粒子"""
+        n = self.active
+        if not n:
+            return
+
+        self.life[:n] -= 1
+        alive = self.life[:n] > 0
+        if not alive.all():
+            # 把存活粒子压缩到数组前部
+            keep = np.flatnonzero(alive)
+            m = len(keep)
+            for array in (self.x, self.y, self.vx, self.vy, self.life,
+                          self.max_life, self.radius, self.color):
+                array[:m] = array[keep]
+            n = self.active = m
+
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+
+    def count(self):
+        """当前存活的粒子数量"""
+        return self.active
+
+    def __len__(self):
+        return self.active
+
+    def stats(self):
+        """返回粒子池的统计信息"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'in_use': self.active,
+            'free': self.capacity - self.active,
+            'high_water': self.high_water,
+        }
+
+    def clear(self):
+        """移除所有粒子"""
+        self.active = 0
+
+    def draw(self, screen, collect_rects=False, back=0.0):
+        """用一次批量blits绘制所有粒子，表面全部取自预渲染图集
+
+        collect_rects为True时返回各粒子绘制到的矩形列表（用于脏矩形渲染）。
+        back为插值比例：粒子沿速度方向回退back个模拟步后绘制。
+        """
+        n = self.active
+        if not n:
+            return [] if collect_rects else None
+
+        radius = self.radius[:n]
+        x, y = self.x[:n], self.y[:n]
+        if back:
+            x = x - self.vx[:n] * back
+            y = y - self.vy[:n] * back
+        left = (x.astype(np.int32) - radius).tolist()
+        top = (y.astype(np.int32) - radius).tolist()
+
+        # 透明度量化后与颜色、半径一起换算为图集下标
+        level = (self.life[:n] / self.max_life[:n] * (ALPHA_LEVELS - 1)
+                 + 0.5).astype(np.int32)
+        index = ((self.color[:n] * (self.max_radius + 1) + radius)
+                 * ALPHA_LEVELS + level).tolist()
+
+        # 序列全部由C实现的迭代器组装，不为每个粒子执行Python字节码
+        return screen.blits(zip(map(self.atlas.__getitem__, index),
+                                zip(left, top)),
+                            collect_rects)
\ No newline at end of file
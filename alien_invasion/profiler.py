@@ -0,0 +1,228 @@
+import logging
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+
+# run_game每帧依次经过的阶段
+PHASES = ['events', 'ship', 'bullets', 'alien_bullets', 'aliens',
+          'alien_fire', 'particles', 'draw', 'flip']
+
+logger = logging.getLogger(__name__)
+
+
+def _noop(name):
+    """关闭时的mark：不读时钟、不记录"""
+
+
+class FrameProfiler:
+    """帧分析器
+
+    主循环在每个阶段结束时调用 mark(阶段名)，分析器把两次调用之间的耗时
+    计入该阶段；一帧内多次模拟步的同名阶段累加。保留最近若干帧的记录，
+    用于绘制叠加层（F3切换）和定期写入日志。
+
+    叠加层、日志和采集都关闭时，mark被替换为空函数，begin_frame/end_frame
+    只做一次布尔判断，测量本身几乎没有开销。
+    """
+
+    def __init__(self, ai_game, history=120, log_interval=0):
+        self.ai_game = ai_game
+        self.visible = False
+        self.log_interval = log_interval
+        # 基准测试等工具逐帧读取 last_frame 时打开
+        self.capture = False
+
+        # 每个阶段最近history帧的耗时（毫秒），以及整帧耗时
+        self.history = {phase: deque(maxlen=history) for phase in PHASES}
+        self.frame_times = deque(maxlen=history)
+        self.frames = 0
+
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._last = 0.0
+        self._frame_start = 0.0
+        # 本帧中途才打开时不记录这一帧（begin_frame没有计时）
+        self._partial = False
+
+        # 叠加层每隔若干帧重新合成一次，避免每帧渲染文字
+        self.refresh_interval = 15
+        # 字体在第一次合成叠加层时才创建
+        self.font = None
+        self._surface = None
+        self.enabled = False
+        self._set_enabled()
+
+    def _set_enabled(self):
+        was_enabled = self.enabled
+        self.enabled = self.visible or self.log_interval > 0 or self.capture
+        self.mark = self._mark if self.enabled else _noop
+        if self.enabled and not was_enabled:
+            # 在帧中途打开（例如F3在事件处理中切换）：从现在开始计时，
+            #   但这一帧不完整，end_frame时丢弃
+            self._frame_start = self._last = perf_counter()
+            self._partial = True
+
+    def toggle(self):
+        """显示或隐藏叠加层"""
+        self.visible = not self.visible
+        self._surface = None
+        self._set_enabled()
+
+    def set_log_interval(self, frames):
+        """每frames帧向日志写一次汇总，0为关闭"""
+        self.log_interval = frames
+        self._set_enabled()
+
+    def set_capture(self, enabled):
+        """打开或关闭逐帧采集（不显示叠加层、不写日志）"""
+        self.capture = enabled
+        self._set_enabled()
+
+    def begin_frame(self):
+        """一帧开始：重置本帧各阶段的计时"""
+        if not self.enabled:
+            return
+        current = self._current
+        for phase in current:
+            current[phase] = 0.0
+        self._frame_start = self._last = perf_counter()
+        self._partial = False
+
+    def _mark(self, name):
+        """把上次mark以来的耗时计入name阶段"""
+        now = perf_counter()
+        self._current[name] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """一帧结束：把本帧各阶段耗时存入历史，必要时写日志"""
+        if not self.enabled:
+            return
+        if self._partial:
+            self._partial = False
+            return
+        self.frame_times.append((self._last - self._frame_start) * 1000)
+        for phase, elapsed in self._current.items():
+            self.history[phase].append(elapsed * 1000)
+        self.frames += 1
+
+        if self.visible and self.frames % self.refresh_interval == 0:
+            self._surface = None
+        if self.log_interval and self.frames % self.log_interval == 0:
+            self._log_summary()
+
+    def last_frame(self):
+        """上一帧各阶段的耗时（毫秒），'frame'为整帧耗时"""
+        timings = {phase: samples[-1] for phase, samples in self.history.items()}
+        timings['frame'] = self.frame_times[-1]
+        return timings
+
+    def averages(self):
+        """各阶段最近若干帧的平均耗时（毫秒）"""
+        return {phase: sum(samples) / len(samples) if samples else 0.0
+                for phase, samples in self.history.items()}
+
+    def worst_frame(self):
+        """最近若干帧中最慢一帧的耗时（毫秒）"""
+        return max(self.frame_times, default=0.0)
+
+    def entity_counts(self):
+        """当前的子弹、外星人和粒子数量"""
+        ai_game = self.ai_game
+        return {
+            'bullets': len(ai_game.bullets),
+            'alien_bullets': len(ai_game.alien_bullets),
+            'aliens': len(ai_game.aliens),
+            'particles': len(ai_game.particle_effect),
+        }
+
+    def _log_summary(self):
+        averages = self.averages()
+        phases = ' '.join(f"{phase}={averages[phase]:.2f}" for phase in PHASES)
+        counts = ' '.join(f"{name}={count}"
+                          for name, count in self.entity_counts().items())
+        logger.info("frame %d avg(ms) %s worst=%.2f %s", self.frames, phases,
+                    self.worst_frame(), counts)
+
+    def draw(self, screen):
+        """在左上角绘制叠加层（内容每refresh_interval帧更新一次）"""
+        if not self.visible:
+            return None
+        if self._surface is None:
+            self._surface = self._compose()
+        return screen.blit(self._surface, (10, 60))
+
+    def _compose(self):
+        """合成阶段耗时表、最慢帧、帧耗时火花线和实体数量"""
+        if self.font is None:
+            self.font = self.ai_game.text.font(None, 22)
+        font = self.font
+        line_height = font.get_linesize()
+        averages = self.averages()
+        counts = self.entity_counts()
+        lines = [(phase, f"{averages[phase]:.2f} ms") for phase in PHASES]
+        lines.append(('frame avg', f"{sum(averages.values()):.2f} ms"))
+        lines.append(('worst', f"{self.worst_frame():.2f} ms"))
+        lines.extend((name, str(count)) for name, count in counts.items())
+
+        spark_height = 40
+        width = 220
+        height = line_height * len(lines) + spark_height + 15
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+
+        # 数值每次都不同，不放进共享的文字缓存
+        for i, (label, value) in enumerate(lines):
+            y = 5 + i * line_height
+            surface.blit(font.render(label, True, (200, 200, 200)), (5, y))
+            value_image = font.render(value, True, (255, 255, 255))
+            surface.blit(value_image,
+                         value_image.get_rect(topright=(width - 5, y)))
+
+        # 帧耗时火花线，灰线为60FPS（16.7ms）预算
+        top = height - spark_height - 5
+        scale = max(self.worst_frame(), 1000 / 30)
+        budget_y = top + spark_height - 1000 / 60 / scale * spark_height
+        pygame.draw.line(surface, (120, 120, 120), (5, budget_y),
+                         (width - 5, budget_y))
+        frame_times = list(self.frame_times)
+        if len(frame_times) > 1:
+            step = (width - 10) / (self.frame_times.maxlen - 1)
+            points = [(5 + i * step,
+                       top + spark_height - value / scale * spark_height)
+                      for i, value in enumerate(frame_times)]
+            pygame.draw.lines(surface, (0, 255, 120), False, points)
+        return surface
+
+
+class StartupTimer:
+    """启动计时：记录从创建游戏到第一帧显示的各阶段耗时
+
+    启动过程在每个阶段结束时调用 mark(阶段名)；第一帧显示后调用 finish，
+    汇总写入日志（--startup-report 时输出）。
+    """
+
+    def __init__(self):
+        self.start = self._last = perf_counter()
+        # (阶段名, 耗时毫秒)，按发生顺序
+        self.phases = []
+        self.total = None
+
+    @property
+    def pending(self):
+        """第一帧还没有显示"""
+        return self.total is None
+
+    def mark(self, name):
+        """把上次mark以来的耗时计入name阶段"""
+        now = perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def finish(self):
+        """第一帧已显示：计算总耗时并写日志"""
+        self.total = (self._last - self.start) * 1000
+        phases = ' '.join(f"{name}={elapsed:.1f}"
+                          for name, elapsed in self.phases)
+        logger.info("startup %.1f ms: %s", self.total, phases)
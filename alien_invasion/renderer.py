@@ -0,0 +1,51 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """脏矩形渲染器
+
+    记录上一帧和本帧所有活动元素占据的矩形，只在这些区域恢复背景，
+    并用 pygame.display.update(rect_list) 提交，而不是整屏重绘后flip。
+    """
+
+    def __init__(self, screen, rect_limit=300):
+        self.screen = screen
+        # 脏矩形过多时，整屏刷新反而更快
+        self.rect_limit = rect_limit
+        self.previous = None
+        self.background_key = None
+
+    def invalidate(self):
+        """下一帧必须整屏重绘"""
+        self.previous = None
+
+    def needs_full_redraw(self, background_key):
+        """上一帧矩形未知或背景已切换时需要整屏重绘"""
+        if background_key != self.background_key:
+            self.background_key = background_key
+            self.previous = None
+        return self.previous is None
+
+    def restore(self, background):
+        """在上一帧的矩形区域内恢复背景（背景可以是表面或纯色）"""
+        screen = self.screen
+        if isinstance(background, pygame.Surface):
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+        else:
+            for rect in self.previous:
+                screen.fill(background, rect)
+
+    def present(self, rects):
+        """提交上一帧和本帧的脏区域"""
+        dirty = self.previous + rects
+        if len(dirty) > self.rect_limit:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.previous = rects
+
+    def present_full(self, rects=None):
+        """整屏提交；rects为本帧元素的矩形，未知时传None"""
+        pygame.display.flip()
+        self.previous = rects
@@ -0,0 +1,229 @@
+"""输入录制与无头回放
+
+录制一局游戏的随机种子、难度和每个模拟步的输入（左移、右移、射击），
+回放时用同样的种子和输入重新驱动模拟，不打开窗口、不限帧，
+并核对中途检查点和结束状态，用于复现线上问题或作为真实负载的基准。
+
+    python alien_invasion.py --record session.replay
+    python replay.py session.replay
+    python replay.py session.replay --repeat 5 --render
+"""
+import os
+import sys
+import json
+import zlib
+import argparse
+from time import perf_counter
+
+
+MAGIC = b'AIREPLAY'
+VERSION = 1
+
+# 每步输入编码为一个字节
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+
+
+def encode_input(ai_game):
+    """把当前的输入状态编码为一个字节"""
+    ship = ai_game.ship
+    return ((LEFT if ship.moving_left else 0)
+            | (RIGHT if ship.moving_right else 0)
+            | (FIRE if ai_game.fire_requested else 0))
+
+
+def apply_input(ai_game, value):
+    """把一个输入字节还原到游戏上"""
+    ai_game.ship.moving_left = bool(value & LEFT)
+    ai_game.ship.moving_right = bool(value & RIGHT)
+    ai_game.fire_requested = bool(value & FIRE)
+
+
+def end_state(ai_game):
+    """用于核对的结束状态：分数、关卡、剩余飞船和各类实体数量"""
+    return {
+        'sim_ticks': ai_game.sim_ticks,
+        'score': ai_game.stats.score,
+        'level': ai_game.stats.level,
+        'ships_left': ai_game.stats.ships_left,
+        'aliens': len(ai_game.aliens),
+        'bullets': len(ai_game.bullets),
+        'alien_bullets': len(ai_game.alien_bullets),
+        'particles': len(ai_game.particle_effect),
+    }
+
+
+def state_checksum(ai_game):
+    """模拟状态的校验和，包含位置等细节，用于定位第一次分歧"""
+    ship = ai_game.ship
+    aliens = ai_game.aliens
+    signature = (
+        tuple(end_state(ai_game).values()),
+        ai_game.state, ship.x, ship.shield_strength,
+        aliens.x, aliens.y, ai_game.settings.fleet_direction,
+        ai_game.last_alien_shot_time,
+        tuple(bullet.y for bullet in ai_game.bullets.sprites()),
+        tuple(bullet.y for bullet in ai_game.alien_bullets.sprites()),
+    )
+    return zlib.crc32(repr(signature).encode())
+
+
+def save_replay(path, header, inputs):
+    """写入录像文件：魔数行、JSON头一行、zlib压缩的输入字节"""
+    with open(path, 'wb') as f:
+        f.write(MAGIC + b' %d\n' % VERSION)
+        f.write(json.dumps(header).encode() + b'\n')
+        f.write(zlib.compress(bytes(inputs), 9))
+
+
+def load_replay(path):
+    """读取录像文件，返回 (头信息, 输入字节)"""
+    with open(path, 'rb') as f:
+        magic = f.readline().split()
+        if len(magic) != 2 or magic[0] != MAGIC:
+            raise ValueError(f"{path} 不是录像文件")
+        if int(magic[1]) != VERSION:
+            raise ValueError(f"不支持的录像版本: {magic[1].decode()}")
+        header = json.loads(f.readline())
+        inputs = zlib.decompress(f.read())
+    return header, inputs
+
+
+class InputRecorder:
+    """录制器：每局开始时start，每个模拟步开始时record，一局结束时finish
+
+    同一进程中录制多局时，第二局起在文件名后追加序号。
+    """
+
+    def __init__(self, path, checkpoint_interval=600):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.games = 0
+        self.active = False
+        self.header = None
+        self.inputs = bytearray()
+        self.checkpoints = []
+
+    def start(self, ai_game):
+        """开始录制新的一局（记录种子、难度和模拟频率）"""
+        if self.active and self.inputs:
+            self.finish(ai_game)
+        self.active = True
+        self.inputs = bytearray()
+        self.checkpoints = []
+        self.header = {
+            'seed': ai_game.seed,
+            'difficulty': ai_game.menu.difficulty_level,
+            'simulation_rate': ai_game.settings.simulation_rate,
+        }
+
+    def record(self, ai_game):
+        """在一个模拟步开始前记录本步的输入，并按间隔记录检查点"""
+        tick = len(self.inputs)
+        if tick and tick % self.checkpoint_interval == 0:
+            self.checkpoints.append([tick, state_checksum(ai_game)])
+        self.inputs.append(encode_input(ai_game))
+
+    def finish(self, ai_game):
+        """结束本局录制并写入文件，返回文件路径（没有任何输入时不写，返回None）"""
+        if not self.active:
+            return None
+        self.active = False
+        if not self.inputs:
+            return None
+        self.header['ticks'] = len(self.inputs)
+        self.header['checkpoints'] = self.checkpoints
+        self.header['end_state'] = end_state(ai_game)
+        self.header['checksum'] = state_checksum(ai_game)
+
+        self.games += 1
+        path = self.path
+        if self.games > 1:
+            stem, ext = os.path.splitext(path)
+            path = f"{stem}.{self.games}{ext}"
+        save_replay(path, self.header, self.inputs)
+        return path
+
+
+class Replayer:
+    """回放器：用录像的种子和输入无头驱动模拟，并核对检查点和结束状态"""
+
+    def __init__(self, header, inputs):
+        self.header = header
+        self.inputs = inputs
+
+    def run(self, render=False):
+        """回放一次，返回结果字典（含耗时和核对结果）
+
+        render为True时每步都绘制一帧（仍不打开窗口），
+        用于把真实对局作为包含渲染的基准负载。
+        """
+        from alien_invasion import AlienInvasion
+
+        ai = AlienInvasion(headless=True, persist=False)
+        # 回放必须停在录制时的结局上，不能像无头模拟那样通关后自动重开
+        ai.auto_restart = False
+        ai.menu.difficulty_level = self.header['difficulty']
+        ai.menu.start_game(self.header['seed'])
+
+        checkpoints = dict(self.header['checkpoints'])
+        profiler = ai.profiler
+        diverged_at = None
+        start = perf_counter()
+        for tick, value in enumerate(self.inputs):
+            if (diverged_at is None and tick in checkpoints
+                    and state_checksum(ai) != checkpoints[tick]):
+                diverged_at = tick
+            profiler.begin_frame()
+            apply_input(ai, value)
+            ai._update_game()
+            if render:
+                ai._update_screen()
+            profiler.end_frame()
+        elapsed = perf_counter() - start
+
+        state = end_state(ai)
+        checksum = state_checksum(ai)
+        return {
+            'ticks': len(self.inputs),
+            'elapsed': elapsed,
+            'ticks_per_second': len(self.inputs) / elapsed if elapsed else 0.0,
+            'end_state': state,
+            'matches': (state == self.header['end_state']
+                        and checksum == self.header['checksum']),
+            'diverged_at': diverged_at,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 录像回放")
+    parser.add_argument('replay', help="录像文件")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="重复回放的次数（用作基准负载）")
+    parser.add_argument('--render', action='store_true',
+                        help="每步都绘制一帧，把渲染计入耗时")
+    args = parser.parse_args()
+
+    header, inputs = load_replay(args.replay)
+    print(f"种子 {header['seed']}，难度 {header['difficulty']}，"
+          f"{header['ticks']} 步")
+    replayer = Replayer(header, inputs)
+    ok = True
+    for run in range(args.repeat):
+        result = replayer.run(args.render)
+        print(f"  第{run + 1}次: {result['elapsed']:.3f}s，"
+              f"{result['ticks_per_second']:.0f} 步/秒")
+        if not result['matches']:
+            ok = False
+            print(f"  结束状态不一致: 录制 {header['end_state']}，"
+                  f"回放 {result['end_state']}")
+            if result['diverged_at'] is not None:
+                print(f"  首次分歧出现在第 {result['diverged_at']} 步之前")
+    if not ok:
+        sys.exit(1)
+    print("结束状态一致")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    shots_fired INTEGER NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score
+    ON runs (difficulty, score DESC, id);
+CREATE INDEX IF NOT EXISTS runs_by_time
+    ON runs (ended_at DESC, id DESC);
+"""
+
+
+class RunHistory:
+    """本地对局历史（SQLite）
+
+    每局结束时写入一行：得分、到达的关卡、难度、时长和射击次数。
+    排行榜（按难度的前N名）和最近对局各有一个索引，翻页使用键集分页
+    （以上一页最后一行为游标），每页只从索引读取需要的行。
+
+    数据库使用WAL模式并设置忙等待超时，同一台机器上同时运行的多个游戏
+    可以安全地读写同一个文件。连接在第一次使用时才打开。
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            # 自动提交模式：每条写入语句单独成为一个短事务
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record_run(self, score, level, difficulty, duration_ms, shots_fired,
+                   ended_at=None):
+        """写入一局的结果，返回这一行的id"""
+        if ended_at is None:
+            ended_at = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO runs (score, level, difficulty, duration_ms,"
+            " shots_fired, ended_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (score, level, difficulty, int(duration_ms), shots_fired,
+             ended_at))
+        return cursor.lastrowid
+
+    def top_scores(self, difficulty, limit, after=None):
+        """某难度得分最高的limit局（字典列表）
+
+        after为上一页最后一行，从它之后继续（分数相同时按id升序）。
+        """
+        query = ("SELECT id, score, level, difficulty, duration_ms,"
+                 " shots_fired, ended_at FROM runs WHERE difficulty = ?")
+        params = [difficulty]
+        if after is not None:
+            query += " AND (score < ? OR (score = ? AND id > ?))"
+            params += [after['score'], after['score'], after['id']]
+        query += " ORDER BY score DESC, id LIMIT ?"
+        params.append(limit)
+        return self._rows(query, params)
+
+    def recent_runs(self, limit, before=None):
+        """最近结束的limit局，before为上一页最后一行"""
+        query = ("SELECT id, score, level, difficulty, duration_ms,"
+                 " shots_fired, ended_at FROM runs")
+        params = []
+        if before is not None:
+            query += " WHERE (ended_at < ? OR (ended_at = ? AND id < ?))"
+            params += [before['ended_at'], before['ended_at'], before['id']]
+        query += " ORDER BY ended_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return self._rows(query, params)
+
+    def _rows(self, query, params):
+        cursor = self._connect().execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,7 +1,4 @@
-import pygame.font
-from pygame.sprite import Group
-
-from ship import Ship
+from pygame.sprite import Group, Sprite
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -13,10 +10,11 @@ class Scoreboard:
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
         self.stats = ai_game.stats
+        self.text = ai_game.text
         
         # Font settings for scoring information.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = self.text.font(None, 48)
 
         # Prepare the initial score images.
         self.prep_score()
@@ -28,7 +26,7 @@ class Scoreboard:
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1)
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True,
+        self.score_image = self.text.render(self.font, score_str,
                 self.text_color, self.settings.bg_color)
         
         # Display the score at the top right of the screen.
@@ -40,7 +38,7 @@ class Scoreboard:
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True,
+        self.high_score_image = self.text.render(self.font, high_score_str,
                 self.text_color, self.settings.bg_color)
         
         # Center the high score at the top of the screen.
@@ -51,7 +49,7 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
-        self.level_image = self.font.render(level_str, True,
+        self.level_image = self.text.render(self.font, level_str,
                 self.text_color, self.settings.bg_color)
         
         # Position the level below the score.
@@ -62,8 +60,12 @@ class Scoreboard:
     def prep_ships(self):
         """Show how many ships are left."""
         self.ships = Group()
+        ship_image = self.ai_game.assets.load_image(self.settings.ship_image)
         for ship_number in range(self.stats.ships_left):
-            ship = Ship(self.ai_game)
+            # 生命图标只需要图像和位置，共享同一个飞船表面
+            ship = Sprite()
+            ship.image = ship_image
+            ship.rect = ship_image.get_rect()
             ship.rect.x = 10 + ship_number * ship.rect.width
             ship.rect.y = 10
             self.ships.add(ship)
@@ -73,32 +75,19 @@ class Scoreboard:
         if self.stats.score > self.stats.high_score:
             self.stats.high_score = self.stats.score
             self.prep_high_score()
+            self.stats.save_high_score()
+
+    def dirty_rects(self):
+        """Return the screen areas covered by the scoreboard."""
+        rects = [self.score_rect.copy(), self.high_score_rect.copy(),
+                 self.level_rect.copy()]
+        rects.extend(ship.rect.copy() for ship in self.ships)
+        return rects
 
-    def show_score(self, screen, offset=(0, 0)):
+    def show_score(self, screen):
         """Draw scores, level, and ships to the screen."""
-        offset_x, offset_y = offset
-        
-        # 绘制分数
-        temp_score_rect = self.score_rect.copy()
-        temp_score_rect.x += offset_x
-        temp_score_rect.y += offset_y
-        screen.blit(self.score_image, temp_score_rect)
-        
-        # 绘制最高分
-        temp_high_score_rect = self.high_score_rect.copy()
-        temp_high_score_rect.x += offset_x
-        temp_high_score_rect.y += offset_y
-        screen.blit(self.high_score_image, temp_high_score_rect)
-        
-        # 绘制等级
-        temp_level_rect = self.level_rect.copy()
-        temp_level_rect.x += offset_x
-        temp_level_rect.y += offset_y
-        screen.blit(self.level_image, temp_level_rect)
-        
+        screen.blit(self.score_image, self.score_rect)
+        screen.blit(self.high_score_image, self.high_score_rect)
+        screen.blit(self.level_image, self.level_rect)
         # 绘制飞船生命指示器
-        for ship in self.ships:
-            temp_ship_rect = ship.rect.copy()
-            temp_ship_rect.x += offset_x
-            temp_ship_rect.y += offset_y
-            screen.blit(ship.image, temp_ship_rect)
\ No newline at end of file
+        screen.blits([(ship.image, ship.rect) for ship in self.ships], False)
@@ -8,8 +8,74 @@ class Settings:
         self.screen_height = 800
         self.bg_color = (230, 230, 230)
 
+        # Rendering settings: dirty-rect mode only restores and presents
+        #   the areas that changed (useful for software rendering).
+        self.dirty_rect_rendering = False
+        self.dirty_rect_limit = 300
+
+        # Number of rendered text surfaces kept in the LRU cache.
+        self.text_cache_size = 256
+        # 系统字体查找结果的缓存文件
+        self.font_cache_file = '.cache/fonts.json'
+
+        # Frame profiler: frames kept for averages and the sparkline,
+        #   and how often a summary is logged (0 = only the F3 overlay).
+        self.profiler_history = 120
+        self.profiler_log_interval = 0
+
+        # Telemetry (off unless --telemetry): sample every N frames into a
+        #   ring buffer that a background thread writes to rotating JSONL
+        #   files, keeping backup_count files of at most max_bytes each.
+        self.telemetry_dir = 'telemetry'
+        self.telemetry_sample_interval = 1
+        self.telemetry_buffer_size = 4096
+        self.telemetry_flush_interval = 1.0
+        self.telemetry_max_bytes = 5 * 1024 * 1024
+        self.telemetry_backup_count = 5
+
+        # Simulation settings: all speeds are per simulation step.
+        self.simulation_rate = 60
+        self.sim_step_ms = 1000 / self.simulation_rate
+        # Rendering is decoupled from the simulation: 0 = unlimited,
+        #   'vsync' = sync to the display, N = cap at N frames per second.
+        self.frame_rate_cap = 60
+        # Most simulation steps run for one rendered frame after a stall.
+        self.max_steps_per_frame = 5
+
+        # Sound effects: file, channel group, concurrent voice limit,
+        #   whether to restart the oldest voice at the limit (steal),
+        #   priority for taking a busy channel in a full group,
+        #   and the minimum retrigger interval in ms.
+        self.sound_effects = {
+            'shoot': {'file': 'sounds/shoot.wav', 'group': 'player',
+                      'voices': 2, 'steal': True, 'priority': 2},
+            'shield_hit': {'file': 'sounds/shield_hit.wav', 'group': 'player',
+                           'voices': 1, 'steal': True, 'priority': 3},
+            'explosion': {'file': 'sounds/explosion.wav', 'group': 'impacts',
+                          'voices': 3, 'steal': True, 'priority': 1,
+                          'interval': 50},
+            'alien_shoot': {'file': 'sounds/alien_shoot.wav',
+                            'group': 'enemy', 'voices': 2, 'priority': 0,
+                            'interval': 80},
+        }
+        # Mixer channels reserved for each group.
+        self.sound_groups = {'player': 3, 'impacts': 3, 'enemy': 2}
+
+        # High score file; updates are written in the background,
+        #   at most once per flush interval (seconds).
+        self.high_score_file = 'high_score.json'
+        self.high_score_flush_interval = 5.0
+        # Run history database and leaderboard rows per page.
+        self.run_history_file = 'run_history.db'
+        self.leaderboard_page_size = 8
+
         # Ship settings
         self.ship_limit = 3
+        # Pause (ms) after a new fleet appears before play resumes.
+        self.respawn_delay = 500
+        # Ignore ship hits (used by the swarm stress test).
+        self.ship_invulnerable = False
+        self.ship_image = 'images/ship.bmp'
 
         # Bullet settings
         self.bullet_width = 3
@@ -23,29 +89,35 @@ class Settings:
         self.alien_bullet_color = (255, 50, 50)
         self.alien_bullets_allowed = 3
 
+        # Object pool settings (pre-warmed capacity)
+        self.bullet_pool_size = 32
+        self.alien_bullet_pool_size = 32
+        self.particle_pool_size = 4096
+
         # Alien settings
+        self.alien_image = 'images/alien.bmp'
         self.fleet_drop_speed = 10
+        # Width of the columns used to pick which alien fires.
+        self.alien_column_width = 50
+
+        # Level definitions: formations, speeds, points and backgrounds.
+        self.levels_file = 'levels.json'
 
         # How quickly the game speeds up
         self.speedup_scale = 1.1
         # How quickly the alien point values increase
         self.score_scale = 1.5
 
-        # 背景设置
-        self.background_types = {
-            'dynamic': [
-                'images/backgrounds/dynamic_bg_1.gif',
-                'images/backgrounds/dynamic_bg_2.gif',
-                'images/backgrounds/dynamic_bg_3.gif',
-                'images/backgrounds/dynamic_bg_4.gif'
-            ],
-            'static': [
-                'images/backgrounds/static_bg_1.png',
-                'images/backgrounds/static_bg_2.png',
-                'images/backgrounds/static_bg_3.png',
-                'images/backgrounds/static_bg_4.png'
-            ]
-        }
+        # 背景设置：每项是静态图片路径，或精灵表动画
+        # {'sheet': 路径, 'frames': 帧数, 'columns': 每行帧数, 'fps': 帧率}
+        self.backgrounds = [
+            'images/backgrounds/static_bg_1.png',
+            'images/backgrounds/static_bg_2.png',
+            'images/backgrounds/static_bg_3.png',
+            'images/backgrounds/static_bg_4.png',
+        ]
+        # 缩放到屏幕分辨率后的背景缓存目录
+        self.background_cache_dir = '.cache/backgrounds'
 
         self.initialize_dynamic_settings()
 
@@ -8,19 +8,22 @@ class Ship(Sprite):
     def __init__(self, ai_game):
         """Initialize the ship and set its starting position."""
         super().__init__()
+        self.ai_game = ai_game
         self.screen = ai_game.screen
         self.settings = ai_game.settings
         self.screen_rect = ai_game.screen.get_rect()
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp')
+        # Get the shared ship image and its rect.
+        self.image = ai_game.assets.load_image(self.settings.ship_image)
         self.rect = self.image.get_rect()
 
         # Start each new ship at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
 
-        # Store a float for the ship's exact horizontal position.
+        # Store a float for the ship's exact horizontal position, and the
+        #   position before the last update for interpolated drawing.
         self.x = float(self.rect.x)
+        self.prev_x = self.x
 
         # Movement flags; start with a ship that's not moving.
         self.moving_right = False
@@ -43,7 +46,7 @@ class Ship(Sprite):
         """开始摧毁动画"""
         self.destroy_animation['active'] = True
         self.destroy_animation['progress'] = 0
-        self.destroy_animation['start_time'] = pygame.time.get_ticks()
+        self.destroy_animation['start_time'] = self.ai_game.sim_ticks
         self.destroy_animation['particles_created'] = False
         
     def update_destroy_animation(self):
@@ -51,7 +54,7 @@ class Ship(Sprite):
         if not self.destroy_animation['active']:
             return False
             
-        current_time = pygame.time.get_ticks()
+        current_time = self.ai_game.sim_ticks
         elapsed = current_time - self.destroy_animation['start_time']
         self.destroy_animation['progress'] = min(elapsed / self.destroy_animation['duration'], 1.0)
         
@@ -101,9 +104,11 @@ class Ship(Sprite):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
+        self.prev_x = self.x
 
     def update(self):
         """Update the ship's position based on movement flags."""
+        self.prev_x = self.x
         # Update the ship's x value, not the rect.
         if self.moving_right and self.rect.right < self.screen_rect.right:
             self.x += self.settings.ship_speed
@@ -133,6 +138,13 @@ class Ship(Sprite):
             self.shield_strength = 0
             return True
 
+    def shield_rect(self):
+        """Return the area covered by the shield bar."""
+        shield_width = 50
+        shield_height = 5
+        return pygame.Rect(self.rect.centerx - shield_width // 2,
+                           self.rect.top - 10, shield_width, shield_height)
+
     def draw_shield(self, screen, offset=(0, 0)):
         """Draw shield indicator."""
         offset_x, offset_y = offset
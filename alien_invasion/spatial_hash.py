@@ -0,0 +1,105 @@
+class SpatialHash:
+    """均匀网格空间哈希，用于碰撞检测的粗筛
+
+    把一组精灵按矩形覆盖的格子登记到网格中，之后每次查询只需检查
+    附近格子里的精灵，而不必与整组精灵逐一比较。网格可以每次用 build
+    重建，也可以由调用方用 insert/remove 增量维护（例如位置不变的精灵）。
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = max(1, int(cell_size))
+        self.cells = {}
+
+    def clear(self):
+        """清空网格"""
+        self.cells.clear()
+
+    def _cell_range(self, rect):
+        """返回矩形覆盖的格子坐标范围"""
+        size = self.cell_size
+        return (rect.left // size, (rect.right - 1) // size,
+                rect.top // size, (rect.bottom - 1) // size)
+
+    def insert(self, sprite):
+        """把精灵登记到它覆盖的所有格子"""
+        cells = self.cells
+        x0, x1, y0, y1 = self._cell_range(sprite.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def remove(self, sprite):
+        """把精灵从它覆盖的所有格子中移除（矩形需与登记时相同）"""
+        cells = self.cells
+        x0, x1, y0, y1 = self._cell_range(sprite.rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                bucket.remove(sprite)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def build(self, group):
+        """用一个精灵组重建网格"""
+        self.cells.clear()
+        for sprite in group.sprites():
+            self.insert(sprite)
+
+    def query(self, rect):
+        """返回与rect相交的已登记精灵（不重复）"""
+        cells = self.cells
+        x0, x1, y0, y1 = self._cell_range(rect)
+        hits = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for sprite in bucket:
+                    if sprite.rect.colliderect(rect) and sprite not in hits:
+                        hits.append(sprite)
+        return hits
+
+    def spritecollide(self, sprite, group, dokill, offset=(0, 0)):
+        """与pygame.sprite.spritecollide语义相同，网格需已由group构建
+
+        offset为group中矩形所在坐标系相对sprite坐标系的偏移。
+        """
+        rect = sprite.rect
+        if offset != (0, 0):
+            rect = rect.move(-offset[0], -offset[1])
+        hits = [other for other in self.query(rect) if other in group]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+    def groupcollide(self, groupa, groupb, dokilla, dokillb, offset=(0, 0)):
+        """与pygame.sprite.groupcollide语义相同的碰撞检测
+
+        用groupb重建网格，返回 {groupa中的精灵: [与之相撞的groupb精灵]}。
+        dokillb为True时，被前面的精灵击中的目标不会再被后面的精灵击中。
+        offset为groupb中矩形所在坐标系相对groupa坐标系的偏移
+        （例如舰队的编队坐标）。groupa为空时不重建网格。
+        """
+        if not groupa:
+            return {}
+        self.build(groupb)
+        return self.collide(groupa, groupb, dokilla, dokillb, offset)
+
+    def collide(self, groupa, groupb, dokilla, dokillb, offset=(0, 0)):
+        """与groupcollide相同，但直接使用已登记的网格（由调用方维护）"""
+        crashed = {}
+        for sprite in groupa.sprites():
+            hits = self.spritecollide(sprite, groupb, dokillb, offset)
+            if hits:
+                crashed[sprite] = hits
+                if dokilla:
+                    sprite.kill()
+        return crashed
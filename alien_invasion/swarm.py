@@ -0,0 +1,193 @@
+"""蜂群压力测试
+
+程序生成1千到1万个外星人的阵型，放开子弹上限和射击频率，
+用正常的主循环（run_game）运行，报告持续帧率、帧耗时百分位和内存峰值。
+作为每次引擎改动的容量测试。
+
+    python swarm.py
+    python swarm.py --aliens 1000 5000 10000 --bullets 500 --fire-interval 0
+    python swarm.py --window --frames 1200
+"""
+import sys
+import json
+import math
+import random
+import argparse
+import tracemalloc
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:
+    # Windows上没有resource模块，不报告常驻内存峰值
+    resource = None
+
+from benchmark import summarize
+
+
+def swarm_level(count, alien_size, screen_size, speed=1.0):
+    """生成一个恰好count个外星人的方阵关卡
+
+    方阵占屏幕宽度的约70%、高度的约一半，外星人过多时彼此重叠，
+    两侧留出空间让舰队可以左右移动。
+    """
+    alien_width, alien_height = alien_size
+    screen_width, screen_height = screen_size
+    area_width = screen_width * 0.7
+    area_height = screen_height * 0.5
+    cols = max(1, round(math.sqrt(count * area_width / area_height)))
+    rows = math.ceil(count / cols)
+    pattern = [cols] * (count // cols)
+    if count % cols:
+        pattern.append(count % cols)
+    spacing = min(2, area_width / (cols * alien_width),
+                  area_height / (rows * alien_height))
+    return {
+        'name': f"swarm-{count}",
+        'speed': speed,
+        'points': 1,
+        'formation': {'type': 'rows_centered', 'pattern': pattern,
+                      'spacing': spacing},
+    }
+
+
+def peak_rss_mb():
+    """进程常驻内存峰值（MB），不支持的平台返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux以KB为单位，macOS以字节为单位
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_swarm(ai, count, frames, warmup, bullets, alien_bullets,
+              fire_interval, trace=False):
+    """用count个外星人运行frames帧（另加warmup帧预热），返回统计结果"""
+    settings = ai.settings
+    saved_settings = dict(vars(settings))
+    saved_levels = ai.level_system.levels
+    settings.bullets_allowed = bullets
+    settings.alien_bullets_allowed = alien_bullets
+    settings.ship_invulnerable = True
+    settings.fleet_drop_speed = 0
+
+    alien_size = ai.assets.image_size(settings.alien_image)
+    screen_size = (settings.screen_width, settings.screen_height)
+    ai.level_system.set_levels([swarm_level(count, alien_size, screen_size)])
+    ai.menu.start_game()
+    # 难度设置会覆盖射击间隔，开始游戏后再设置
+    settings.alien_fire_frequency = fire_interval
+
+    stamps = []
+
+    def controller(game):
+        # 飞船左右往返并持续射击
+        game.ship.moving_right = (game.sim_ticks // 2000) % 2 == 0
+        game.ship.moving_left = not game.ship.moving_right
+        game.fire_requested = True
+        stamps.append(perf_counter())
+
+    if trace:
+        tracemalloc.start()
+    ai.run_game(warmup, controller)
+    stamps.clear()
+    ai.audio.reset_stats()
+    if trace:
+        tracemalloc.reset_peak()
+    start_ticks = ai.sim_ticks
+    ai.run_game(frames + 1, controller)
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+
+    frame_times = [b - a for a, b in zip(stamps, stamps[1:])]
+    elapsed = stamps[-1] - stamps[0]
+    result = {
+        'aliens': count,
+        'frames': len(frame_times),
+        'fps': len(frame_times) / elapsed if elapsed else 0.0,
+        'sim_steps_per_second': ((ai.sim_ticks - start_ticks)
+                                 / settings.sim_step_ms / elapsed
+                                 if elapsed else 0.0),
+        'frame_ms': summarize(frame_times),
+        'peak_rss_mb': peak_rss_mb(),
+        'traced_peak_mb': (traced_peak / (1024 * 1024)
+                           if traced_peak is not None else None),
+        'alive': len(ai.aliens),
+        'bullets': len(ai.bullets),
+        'alien_bullets': len(ai.alien_bullets),
+        'particles': len(ai.particle_effect),
+        'audio': ai.audio.stats(),
+    }
+
+    vars(settings).update(saved_settings)
+    ai.level_system.set_levels(saved_levels)
+    ai.menu.return_to_main_menu()
+    return result
+
+
+def print_report(results):
+    """以表格形式打印结果"""
+    print(f"{'aliens':>8}{'fps':>9}{'steps/s':>9}{'p50':>9}{'p95':>9}"
+          f"{'p99':>9}{'rss MB':>9}{'heap MB':>9}")
+    for result in results:
+        stats = result['frame_ms']
+        rss = result['peak_rss_mb']
+        heap = result['traced_peak_mb']
+        print(f"{result['aliens']:>8}{result['fps']:>9.1f}"
+              f"{result['sim_steps_per_second']:>9.1f}"
+              f"{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['p99']:>9.2f}"
+              f"{rss if rss is not None else float('nan'):>9.1f}"
+              f"{heap if heap is not None else float('nan'):>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion 蜂群压力测试")
+    parser.add_argument('--aliens', type=int, nargs='+',
+                        default=[1000, 2000, 5000, 10000],
+                        help="每轮的外星人数量")
+    parser.add_argument('--bullets', type=int, default=200,
+                        help="玩家子弹上限")
+    parser.add_argument('--alien-bullets', type=int, default=200,
+                        help="外星人子弹上限")
+    parser.add_argument('--fire-interval', type=int, default=50,
+                        help="外星人射击间隔（毫秒，0为每个模拟步都射击）")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=2077)
+    parser.add_argument('--fps-cap', type=int, default=0,
+                        help="帧率上限（默认0为不限帧，测量最大吞吐）")
+    parser.add_argument('--window', action='store_true',
+                        help="打开真实窗口（默认使用虚拟显示驱动）")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="使用脏矩形渲染模式")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="用tracemalloc统计Python堆峰值（会拖慢运行）")
+    parser.add_argument('--output', default='swarm_results.json')
+    args = parser.parse_args()
+
+    from alien_invasion import AlienInvasion
+
+    random.seed(args.seed)
+    ai = AlienInvasion(headless=not args.window, seed=args.seed,
+                       persist=False)
+    ai.settings.frame_rate_cap = args.fps_cap
+    ai.settings.dirty_rect_rendering = args.dirty_rects
+    # 蜂群被全部击落时立即重新生成，窗口模式下也不停在通关画面
+    ai.auto_restart = True
+
+    results = []
+    # 从小到大运行，常驻内存峰值才能对应到每一轮
+    for count in sorted(args.aliens):
+        results.append(run_swarm(ai, count, args.frames, args.warmup,
+                                 args.bullets, args.alien_bullets,
+                                 args.fire_interval, args.tracemalloc))
+    print_report(results)
+
+    with open(args.output, 'w') as f:
+        json.dump({'args': vars(args), 'results': results}, f, indent=2)
+    print(f"\n结果已写入 {args.output}")
+
+
+if __name__ == '__main__':
+    main()
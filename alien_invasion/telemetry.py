@@ -0,0 +1,168 @@
+"""遥测：按帧采样运行指标，由后台线程写入滚动的JSONL文件
+
+主循环每隔若干帧调用一次 sample，只把一个元组写进预先分配的环形缓冲区，
+不加锁、不做I/O，开销在微秒级。后台线程定期取出缓冲区中的记录，
+转换为JSON行追加到 telemetry.jsonl，文件超过大小上限时滚动为
+telemetry.1.jsonl、telemetry.2.jsonl……，只保留最近的若干个文件。
+"""
+import json
+import os
+import threading
+import time
+from time import perf_counter
+
+
+# 帧采样元组中各字段的名字（第一个字段是记录类型）
+FRAME_FIELDS = ('t', 'frame_ms', 'bullets', 'aliens', 'alien_bullets',
+                'particles', 'level', 'score', 'state')
+
+
+class RingBuffer:
+    """单生产者、单消费者的环形缓冲区
+
+    生产者（主线程）只写槽位和 head，消费者（写入线程）只读槽位和写 tail，
+    两边不共享任何可变状态，因此不需要锁。消费者跟不上时，
+    最旧的记录被覆盖并计入 dropped。
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def push(self, record):
+        head = self.head
+        self.slots[head % self.capacity] = record
+        self.head = head + 1
+
+    def drain(self):
+        """取出自上次以来写入的全部记录（按写入顺序）"""
+        head = self.head
+        tail = self.tail
+        if head - tail > self.capacity:
+            # 被覆盖的记录已经无法取回
+            self.dropped += head - tail - self.capacity
+            tail = head - self.capacity
+        records = [self.slots[i % self.capacity] for i in range(tail, head)]
+        # 复制期间生产者可能已经绕回并覆盖了最前面的槽位，这些记录丢弃
+        overwritten = self.head - self.capacity - tail
+        if overwritten > 0:
+            self.dropped += overwritten
+            del records[:overwritten]
+        self.tail = head
+        return records
+
+
+class Telemetry:
+    """遥测采集与写入
+
+    记录有三种：'frame'（每sample_interval帧一次：帧耗时、实体数量、关卡、
+    得分、状态）、'run'（每局结束时的汇总）和'session'（退出时的汇总）。
+    """
+
+    def __init__(self, ai_game, directory, sample_interval=1,
+                 buffer_size=4096, flush_interval=1.0,
+                 max_bytes=5 * 1024 * 1024, backup_count=5):
+        self.ai_game = ai_game
+        self.directory = directory
+        self.path = os.path.join(directory, 'telemetry.jsonl')
+        self.sample_interval = max(1, sample_interval)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.buffer = RingBuffer(buffer_size)
+        self.frames = 0
+        self.samples = 0
+        self._countdown = self.sample_interval
+        self._last = perf_counter()
+        self._started = time.time()
+
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='telemetry',
+                                        daemon=True)
+        self._worker.start()
+
+    def sample(self):
+        """每帧结束时调用；每sample_interval帧写入一条帧记录"""
+        now = perf_counter()
+        frame_ms = (now - self._last) * 1000
+        self._last = now
+        self.frames += 1
+        self._countdown -= 1
+        if self._countdown:
+            return
+        self._countdown = self.sample_interval
+        self.samples += 1
+
+        ai_game = self.ai_game
+        self.buffer.push(('frame', time.time(), frame_ms,
+                          len(ai_game.bullets), len(ai_game.aliens),
+                          len(ai_game.alien_bullets),
+                          len(ai_game.particle_effect), ai_game.stats.level,
+                          ai_game.stats.score, ai_game.state))
+
+    def record_run(self, summary):
+        """写入一局结束时的汇总（字典）"""
+        self.buffer.push(('run', time.time(), summary))
+
+    def _run(self):
+        """后台线程：定期取出缓冲区并写入文件"""
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _flush(self):
+        records = self.buffer.drain()
+        if not records:
+            return
+        lines = []
+        for record in records:
+            kind = record[0]
+            if kind == 'frame':
+                data = dict(zip(FRAME_FIELDS, record[1:]))
+                data['frame_ms'] = round(data['frame_ms'], 3)
+            else:
+                data = {'t': record[1], **record[2]}
+            data['type'] = kind
+            lines.append(json.dumps(data, ensure_ascii=False))
+        try:
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Warning: Could not write telemetry: {e}")
+
+    def _rotate(self):
+        """telemetry.jsonl -> telemetry.1.jsonl -> ...，超出保留数量的删除"""
+        self._file.close()
+        stem, ext = os.path.splitext(self.path)
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{stem}.{index}{ext}"
+            if os.path.exists(source):
+                os.replace(source, f"{stem}.{index + 1}{ext}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{stem}.1{ext}")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        """写入会话汇总，停止后台线程并写出剩余记录（退出时调用）"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._worker.join()
+        self._flush()
+        self.buffer.push(('session', time.time(), {
+            'duration_s': round(time.time() - self._started, 3),
+            'frames': self.frames,
+            'samples': self.samples,
+            'dropped': self.buffer.dropped,
+        }))
+        self._flush()
+        self._file.close()
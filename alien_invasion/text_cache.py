@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """文字渲染服务：按 (字体, 文本, 颜色, 背景) 缓存渲染结果，容量有限（LRU）
+
+    返回的表面会被多处共享，调用方不要修改它们。
+    """
+
+    def __init__(self, max_size=256, font_cache=None):
+        self.max_size = max_size
+        # 系统字体名到文件路径的查找缓存（FontCache），为None时每次都查找系统字体库
+        self.font_cache = font_cache
+        self.surfaces = OrderedDict()
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size):
+        """返回（并缓存）字体对象
+
+        name为None时使用pygame自带的默认字体，不查找系统字体库；
+        系统中没有该字体时同样退回默认字体。
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            path = self.font_path(name) if name else None
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+    def font_path(self, name):
+        """返回系统字体的文件路径，系统中没有时返回None"""
+        if self.font_cache is not None:
+            return self.font_cache.resolve(name)
+        return pygame.font.match_font(name)
+
+    def render(self, font, text, color, background=None, antialias=True):
+        """渲染文本，命中缓存时直接返回之前的表面"""
+        key = (font, text, antialias, color, background)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        surfaces[key] = surface
+        if len(surfaces) > self.max_size:
+            surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空已渲染的文本（例如切换语言或字体后）"""
+        self.surfaces.clear()